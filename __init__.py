@@ -16,18 +16,23 @@ from . import check
 from . import interpolation
 from . import lagrange
 from . import submit
+from . import dataset
 from . material import Material
-from . momenttensor import MomentTensor
+from . momenttensor import MomentTensor, MomentTensors
 from . config import Config
-from . sgt import stresses_to_strains, strains_to_stresses, compute_velocity
+from . dataset import Dataset
+from . sgt import stresses_to_strains, strains_to_stresses, compute_velocity\
+        , compute_velocities, stresses_to_strains_stacked\
+        , strains_to_stresses_stacked
 from . source import Source, write_source_input, write_recv_input, write_source\
         , write_force
 from . command import Command, write_awp_input
 from . printing import latex, terms, str_eqs, str_tensor_eqs 
 from . utils import Struct
-from . reader import load, time, load_all, load_edge_2d, load_edge_3d, load_selected
+from . reader import load, time, load_all, load_edge_2d, load_edge_3d, load_selected\
+        , load_window, load_blocks
 from . command import parse
 from . solution import init_fields, print_difference
 from . topography import Topography
 from . plot import plot_tensor
-from . rsgt import rwgtoawp, fromrsgtfile 
+from . rsgt import rwgtoawp, fromrsgtfile, fromrsgtfile_batch
@@ -86,8 +86,17 @@ class Config(object):
                            self.settings.nskpz[grid_num]))
         return (int(size_x), int(size_y), int(size_z))
 
+    def output_file(self, field, grid_num, num=1):
+        """
+        Name of the surface output file for a field, grid block, and file
+        number (starts at 1).
+
+        """
+        nsteps = self.settings.write_step*self.settings.ntiskp
+        return 'S%s_%d_%07d' % (field.upper(), grid_num, nsteps*num)
+
     def load_data(self, field, grid_num, num=1, verbose=0, normalize=1,
-                  center=None):
+                  center=None, mmap=0):
         """
         Load velocity component data from file.
 
@@ -99,6 +108,9 @@ class Config(object):
             normalize(optional): Normalize grid points by grid spacing.
             center(optional): Shift grid vectors so that center lies at (0, 0,
                 0)
+            mmap(optional): Memory map the file instead of reading it. The
+                returned data is then a read-only view and slicing it only
+                reads the bytes that are accessed from disk.
 
         Returns:
                 Struct: Grid vectors (x, y, z) Time vector (t), and data
@@ -108,14 +120,22 @@ class Config(object):
         write_step = self.settings.write_step
         nsteps = write_step*self.settings.ntiskp
 
-        frame = nsteps*num
-        filename = 'S%s_%d_%07d' % (field.upper(), grid_num, frame)
+        filename = self.output_file(field, grid_num, num)
         size = self.output_size(grid_num)
-        out = np.fromfile('%s/%s' % (self.output_path, 
-                          filename),
-                          dtype=self.settings.prec).reshape(write_step, 
-                                                            size[2],
-                                                            size[1], size[0])
+        shape = (write_step, size[2], size[1], size[0])
+        if mmap:
+            path = '%s/%s' % (self.output_path, filename)
+            itemsize = np.dtype(self.settings.prec).itemsize
+            count = os.path.getsize(path) // itemsize
+            if count != np.prod(shape):
+                raise ValueError('cannot reshape array of size %d into shape '
+                                 '%s' % (count, shape))
+            out = np.memmap(path, dtype=self.settings.prec, mode='r',
+                            shape=shape)
+        else:
+            out = np.fromfile('%s/%s' % (self.output_path, 
+                              filename),
+                              dtype=self.settings.prec).reshape(shape)
         t = self.settings.dt*np.array(range(nsteps*(num-1), nsteps*num,
                                       self.settings.ntiskp))
 
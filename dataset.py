@@ -0,0 +1,154 @@
+"""
+Access the surface output of a simulation as one continuous dataset that spans
+all of the output frames written to disk.
+
+"""
+import os
+import numpy as np
+from pyawp import utils
+
+
+class Dataset(object):
+
+    def __init__(self, config, field, grid_num=0, normalize=1, center=None,
+                 num_frames=None):
+        """
+        Initialize Dataset.
+
+        Args:
+            config: Config object used to launch the simulation.
+            field: Velocity field component ('x', 'y', 'z').
+            grid_num(optional): Grid block ID. Top block is `0`.
+            normalize(optional): Normalize grid points by grid spacing.
+            center(optional): Shift grid vectors so that center lies at (0, 0,
+                0)
+            num_frames(optional): Number of frames in the dataset. Defaults to
+                all frames found under the output path of `config`.
+
+        """
+        self.config = config
+        self.field = field
+        self.grid_num = grid_num
+        self.normalize = normalize
+        self.center = center
+
+        if num_frames is None:
+            num_frames = 0
+            while os.path.exists(self.file(num_frames + 1)):
+                num_frames += 1
+        if num_frames == 0:
+            raise FileNotFoundError("No output found: %s" % self.file(1))
+        self.num_frames = num_frames
+
+        first = self.load_frame(1)
+        self.x = first.x
+        self.y = first.y
+        self.z = first.z
+        self.shape = first.data.shape[:3] + (self.num_steps,)
+
+    def file(self, num):
+        return '%s/%s' % (self.config.output_path,
+                          self.config.output_file(self.field, self.grid_num,
+                                                  num))
+
+    def load_frame(self, num):
+        """
+        Memory map the output frame `num` (starts at 1). See
+        `Config.load_data`.
+
+        """
+        return self.config.load_data(self.field, self.grid_num, num=num,
+                                     normalize=self.normalize,
+                                     center=self.center, mmap=1)
+
+    @property
+    def write_step(self):
+        return self.config.settings.write_step
+
+    @property
+    def num_steps(self):
+        return self.num_frames*self.write_step
+
+    @property
+    def dt(self):
+        """
+        Time step between two consecutive output samples.
+        """
+        return self.config.settings.dt*self.config.settings.ntiskp
+
+    @property
+    def t(self):
+        return self.dt*np.arange(self.num_steps)
+
+    def steps(self, first, last):
+        """
+        Load the output samples `first` to `last` (exclusive) into a single
+        array. Only the frames that overlap with the requested range are read.
+
+        Returns:
+            np.array [x, y, z, t]
+
+        """
+        first = max(first, 0)
+        last = min(last, self.num_steps)
+        out = np.zeros(self.shape[:3] + (max(last - first, 0),),
+                       dtype=self.config.settings.prec)
+        for num in range(first // self.write_step + 1,
+                         (last - 1) // self.write_step + 2):
+            offset = (num - 1)*self.write_step
+            lo = max(first - offset, 0)
+            hi = min(last - offset, self.write_step)
+            data = self.load_frame(num).data
+            out[..., offset + lo - first:offset + hi - first] = \
+                    data[..., lo:hi]
+        return out
+
+    def window(self, t0, t1):
+        """
+        Load the output in the time window `t0 <= t < t1`.
+
+        Returns:
+            Struct: Grid vectors (x, y, z) Time vector (t), and data
+            (np.array [x, y, z, t])
+
+        """
+        first = int(np.ceil(t0/self.dt - 1e-6))
+        last = int(np.ceil(t1/self.dt - 1e-6))
+        out = utils.Struct()
+        out.data = self.steps(first, last)
+        out.t = self.dt*np.arange(max(first, 0), max(first, 0) +
+                                  out.data.shape[-1])
+        out.x = self.x
+        out.y = self.y
+        out.z = self.z
+        out.normalize = self.normalize
+        return out
+
+    def frames(self, prefetch=0):
+        """
+        Iterate over all frames in order.
+
+        Args:
+            prefetch(optional): Read the next frame on a background thread
+                while the current frame is processed.
+
+        Yields:
+            t, data: Time vector and data (np.array [x, y, z, t]) for each
+            frame.
+
+        """
+        if not prefetch:
+            for num in range(1, self.num_frames + 1):
+                frame = self.load_frame(num)
+                yield frame.t, np.array(frame.data)
+            return
+
+        from concurrent.futures import ThreadPoolExecutor
+        read = lambda num: np.array(self.load_frame(num).data)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(read, 1)
+            for num in range(1, self.num_frames + 1):
+                data = future.result()
+                if num < self.num_frames:
+                    future = executor.submit(read, num + 1)
+                yield self.load_frame(num).t, data
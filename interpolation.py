@@ -10,63 +10,196 @@ def nearest(query, data):
         data(Struct): Field data array that contains (x, y, z, and data)
 
     """
-    out = np.zeros((query.shape[0], len(data.t)))
-    for l, qp in enumerate(query):
-        i = argnearest(qp[0], data.x)
-        j = argnearest(qp[1], data.y)
-        k = argnearest(qp[2], data.z)
-        out[l,:] = data.data[i, j, k, :]
-    return out
+    query = np.asarray(query)
+    i = argnearest(query[:,0], data.x)
+    j = argnearest(query[:,1], data.y)
+    k = argnearest(query[:,2], data.z)
+    return np.asarray(data.data[i, j, k, :], dtype=np.float64)
 
 def lagrange(query, data, degree=None):
     """
     Estimate solution at query points using Lagrange interpolation.
 
+    All query points are evaluated at once: the stencil indices and
+    tensor-product weights are computed for every query point, followed by a
+    single gather of the data and a weighted sum over the stencils. Use
+    `lagrange_operator` to reuse the weights for repeated evaluations.
+
     Args:
         query(np.array): Query grid points ( number of queries x 3 )
         data(Struct): Field data array that contains (x, y, z, and data)
-        degree(optional): Degree of Lagrange interpolating polynomial. Defaults
-            to `degree = 1` (linear interpolation).
+        degree(optional): Degree of Lagrange interpolating polynomial, either
+            one value for all axes or one value per axis. Defaults to 
+            `degree = 1` (linear interpolation).
+
+    """
+    op = lagrange_operator(query, data.x, data.y, data.z, degree)
+    return op.apply(data.data)
+
+class Operator(object):
+
+    def __init__(self, idx_x, idx_y, idx_z, Lx, Ly, Lz):
+        """
+        Interpolation operator that maps field data defined on a grid to a
+        fixed set of query points. Once constructed, the operator can be
+        applied to any number of data arrays defined on the same grid (e.g.,
+        different output frames, fields, or runs) at the cost of a gather and
+        a weighted sum.
+
+        Use `lagrange_operator` to construct the operator for query points, and
+        `load_operator` to load a previously saved operator.
+
+        Args:
+            idx_x, idx_y, idx_z: Stencil indices along each axis (number of
+                queries x stencil length).
+            Lx, Ly, Lz: Interpolation weights along each axis, same size as the
+                stencil indices.
+
+        """
+        self.idx_x = np.asarray(idx_x)
+        self.idx_y = np.asarray(idx_y)
+        self.idx_z = np.asarray(idx_z)
+        self.Lx = np.asarray(Lx)
+        self.Ly = np.asarray(Ly)
+        self.Lz = np.asarray(Lz)
+        self.weights = np.einsum('li,lj,lk->lijk', self.Lx, self.Ly, self.Lz)
+
+    @property
+    def num_queries(self):
+        return self.idx_x.shape[0]
+
+    def apply(self, data):
+        """
+        Interpolate data to the query points.
+
+        Args:
+            data: Field data (np.array [x, y, z, t], or Struct containing
+                `data`).
+
+        Returns:
+            np.array : Interpolated data ( number of queries x t )
+
+        """
+        if isinstance(data, dict):
+            data = data['data']
+        values = data[self.idx_x[:,:,None,None], self.idx_y[:,None,:,None],
+                      self.idx_z[:,None,None,:], :]
+        return np.einsum('lijk,lijkt->lt', self.weights, values)
+
+    def __call__(self, data):
+        return self.apply(data)
+
+    def save(self, filename):
+        """
+        Save operator to disk (`.npz` format).
+
+        """
+        np.savez(filename, idx_x=self.idx_x, idx_y=self.idx_y,
+                 idx_z=self.idx_z, Lx=self.Lx, Ly=self.Ly, Lz=self.Lz)
+
+def lagrange_operator(query, x, y, z, degree=None):
+    """
+    Construct the Lagrange interpolation operator for the query points. See
+    `lagrange`.
+
+    Args:
+        query(np.array): Query grid points ( number of queries x 3 )
+        x, y, z(np.array): Grid vectors (e.g., obtained from `grid.vx`).
+        degree(optional): Degree of Lagrange interpolating polynomial, either
+            one value for all axes or one value per axis. Use `degree = 0` for
+            nearest neighbor interpolation. Defaults to `degree = 1`.
+
+    Returns:
+        Operator
 
     """
-    from pyawp.lagrange import lagrange
-    
     if degree is None:
         degree = np.ones((3,))
+    degree = np.broadcast_to(degree, (3,))
+    query = np.asarray(query)
 
-    out = np.zeros((query.shape[0], len(data.t)))
     nnodes = degree + 1
     left = [np.floor(ni/2) for ni in nnodes]
     right = [np.floor(ni/2) for ni in nnodes]
 
-    for l, qp in enumerate(query):
-        xn, idx_x = argnearest_range(qp[0], data.x, left[0], right[0])
-        yn, idx_y = argnearest_range(qp[1], data.y, left[1], right[1])
-        zn, idx_z = argnearest_range(qp[2], data.z, left[2], right[2])
+    idx_x, Lx = lagrange_stencil(query[:,0], x, left[0], right[0])
+    idx_y, Ly = lagrange_stencil(query[:,1], y, left[1], right[1])
+    idx_z, Lz = lagrange_stencil(query[:,2], z, left[2], right[2])
+    return Operator(idx_x, idx_y, idx_z, Lx, Ly, Lz)
 
-        Lx = lagrange(qp[0], data.x[idx_x])
-        Ly = lagrange(qp[1], data.y[idx_y])
-        Lz = lagrange(qp[2], data.z[idx_z])
+def load_operator(filename):
+    """
+    Load an interpolation operator saved by `Operator.save`.
 
-        for i, xi in enumerate(idx_x):
-            for j, yj in enumerate(idx_y):
-                for k, zk in enumerate(idx_z):
-                    out[l,:] += Lx[i]*Ly[j]*Lz[k]*data.data[xi, yj, zk, :]
-        return out
+    """
+    with np.load(filename) as f:
+        return Operator(f['idx_x'], f['idx_y'], f['idx_z'], f['Lx'], f['Ly'],
+                        f['Lz'])
+
+def lagrange_stencil(qp, x, left=0, right=0):
+    """
+    Find the stencil and Lagrange weights for each query point along one axis.
+
+    Args:
+        qp(np.array) : Query points.
+        x(np.array) : Grid points.
+        left(int, optional) : Number of points to the left.
+        right(int, optional) : Number of points to the right.
+
+    Returns:
+        idx : Grid point indices of the stencils (number of queries x stencil
+            length).
+        L : Lagrange basis evaluated at each query point, same size as `idx`.
+
+    """
+    from pyawp.lagrange import basis
+
+    qp = np.atleast_1d(qp)
+    inearest, idx = argnearest_ranges(qp, x, left, right)
+    L = basis(qp, np.asarray(x)[idx])
+    return idx, L
 
 def argnearest(qp, x):
     """
     Find the index of the grid point nearest the query point qp.
 
+    The grid points must be sorted (either increasing or decreasing). Uniform
+    grids are located by direct arithmetic and non-uniform grids by binary
+    search. Ties are resolved in favor of the grid point with the smallest
+    index (as for `np.argmin`).
+
     Args:
-        qp(float) : Query point.
+        qp(float or np.array) : Query point(s).
         x(np.array) : Grid points.
 
     Returns:
-        inearest : Index of grid point nearest to query point.
+        inearest : Index of grid point nearest to query point (same shape as
+            `qp`).
 
     """
-    inearest = np.argmin(abs(qp - x))
+    x = np.asarray(x)
+    n = len(x)
+    is_scalar = np.ndim(qp) == 0
+    qp = np.asarray(qp, dtype=np.float64)
+
+    if n == 1:
+        inearest = np.zeros(qp.shape, dtype=np.int64)
+    elif x[-1] < x[0]:
+        inearest = argnearest(-qp, -x)
+    else:
+        if is_uniform(x):
+            h = (x[-1] - x[0]) / (n - 1)
+            ileft = np.floor((qp - x[0]) / h).astype(np.int64)
+            ileft = np.clip(ileft, 0, n - 2)
+            iright = ileft + 1
+        else:
+            iright = np.clip(np.searchsorted(x, qp), 1, n - 1)
+            ileft = iright - 1
+        inearest = np.where(abs(qp - x[ileft]) <= abs(qp - x[iright]), ileft,
+                            iright)
+
+    if is_scalar:
+        return int(inearest)
     return inearest
 
 def argnearest_range(qp, x, left=0, right=0):
@@ -91,17 +224,43 @@ def argnearest_range(qp, x, left=0, right=0):
         inearest : Index of grid point nearest to query point.
         irange(tuple) : First and last index + 1 of grid points in stenci.
 
+    """
+    inearest, idx = argnearest_ranges(qp, x, left, right)
+    return int(inearest[0]), range(idx[0,0], idx[0,-1] + 1)
+
+def argnearest_ranges(qp, x, left=0, right=0):
+    """
+    Find the nearest grid point and stencil indices for each query point. See
+    `argnearest_range`.
+
+    Args:
+        qp(np.array) : Query points.
+        x(np.array) : Grid points.
+        left(int, optional) : Number of points to the left.
+        right(int, optional) : Number of points to the right.
+
+    Returns:
+        inearest : Index of grid point nearest to each query point.
+        idx : Indices of the grid points in each stencil (number of queries x
+            stencil length).
+
     """
     left = int(left)
     right = int(right)
+    width = left + right + 1
 
-    inearest = argnearest(qp, x)
-    diffleft = inearest - left
-    diffright = len(x) - inearest - right - 1
-    ileft = max(diffleft, 0) + min(diffright, 0)
-    iright = min(inearest + right + 1, len(x)) - min(diffleft, 0)
+    # Check that stencil length can be preserved
+    assert width <= len(x)
 
-    # Check that stencil length is preserved
-    assert iright - ileft == left + right + 1
+    inearest = argnearest(np.atleast_1d(qp), x)
+    ileft = np.clip(inearest - left, 0, len(x) - width)
+    idx = ileft[:,None] + np.arange(width)
+    return inearest, idx
 
-    return inearest, range(ileft, iright)
+def is_uniform(x, rtol=1e-10):
+    """
+    Check if the grid points `x` are uniformly spaced.
+
+    """
+    dx = np.diff(x)
+    return np.all(np.abs(dx - dx[0]) <= rtol * np.abs(dx[0]))
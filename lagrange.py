@@ -1,3 +1,7 @@
+import functools
+import numpy as np
+
+
 def lagrange(x0, x):
     """
     Compute the Lagrange basis at the nodes `x` and evaluate each basis function
@@ -11,45 +15,86 @@ def lagrange(x0, x):
     Returns:
         L : Lagrange basis (array of the same length as `x`). 
     """
-    import numpy as np
+    return basis(x0, x)[0,:]
+
+def basis(x0, x):
+    """
+    Evaluate the Lagrange basis at many points using the barycentric formula
 
-    if len(x) == 1:
-        return [1.0]
+        L_j(x0) = (w_j / (x0 - x_j)) / sum_k (w_k / (x0 - x_k)),
 
-    n = len(x)
-    L = np.zeros((n,))
-    l = node_polynomial(x0, x)
-    for j in range(n):
-            L[j] = lagrange_basis(x0, j, x, l)
+    where `w` are the barycentric weights of the nodes (see `weights`).
+    
+    Args:
+        x0 : Points to evaluate basis functions at (array of length npoints).
+        x : Nodes to construct basis functions at. Either one set of nodes
+            shared by all points (array of length nnodes), or one set of nodes
+            per point (array of size npoints x nnodes).
     
+    Returns:
+        L : Lagrange basis (array of size npoints x nnodes). 
+
+    """
+    x0 = np.atleast_1d(np.asarray(x0, dtype=np.float64))
+    x = np.asarray(x, dtype=np.float64)
+    w = weights(x)
+    if x.ndim == 1:
+        x = x[None,:]
+        w = w[None,:]
+
+    d = x0[:,None] - x
+    exact = d == 0
+    d[exact] = 1.0
+    L = w / d
+    L = L / np.sum(L, axis=1, keepdims=True)
+
+    on_node = np.any(exact, axis=1)
+    L[on_node,:] = exact[on_node,:]
     return L
 
-def node_polynomial(x0, x):
-    # Compute node polynomial
-    l = 1.0;
-    n = len(x)
-    for i in range(n):
-            l = l*(x[i] - x0)
-    return l
-
-def lagrange_basis(x0, j, x, l):
-     # Compute a lagrange basis function L_j at node `x_j` and evaluate it at 
-     # `x0`
-     import numpy as np
-     n = len(x)
-     lj = 1.0
-     denom = 1.0
-
-     if abs(x[j] - x0) < 1e-12:
-        return lj;
-
-     for k in range(n):
-         if j == k:
-            continue
-         denom = denom*(x[j] - x[k])
-     
-
-     lam = 1.0/denom
-     lj = l*lam/(x0 - x[j])
-
-     return lj
+def weights(x):
+    """
+    Compute the barycentric weights w_j = 1 / prod_{k != j} (x_j - x_k). 
+
+    The weights only depend on the spacing between the nodes. Since the
+    weights scale as h^-(nnodes - 1) when the spacing is scaled by h, they are
+    cached for each distinct spacing relative to the first spacing `h`, and
+    then rescaled.
+
+    Args:
+        x : Nodes (array of length nnodes), or one set of nodes per row
+            (array of size nsets x nnodes).
+
+    Returns:
+        w : Barycentric weights (same size as `x`).
+
+    """
+    x = np.asarray(x, dtype=np.float64)
+    is_1d = x.ndim == 1
+    x = np.atleast_2d(x)
+    n = x.shape[1]
+    if n == 1:
+        w = np.ones(x.shape)
+    else:
+        dx = np.diff(x, axis=1)
+        h = dx[:,:1]
+        ratios = np.round(dx / h, 12)
+        ratios, inv = np.unique(ratios, axis=0, return_inverse=True)
+        w = np.array([spacing_weights(tuple(ri)) for ri in ratios])
+        w = w[inv.ravel(),:] * h**(1 - n)
+
+    if is_1d:
+        return w[0,:]
+    return w
+
+@functools.lru_cache(maxsize=1024)
+def spacing_weights(ratios):
+    """
+    Compute the barycentric weights for nodes with spacing `ratios` (tuple),
+    given relative to the first spacing. See `weights`.
+
+    """
+    x = np.concatenate(([0.0], np.cumsum(ratios)))
+    diff = x[:,None] - x[None,:]
+    np.fill_diagonal(diff, 1.0)
+    return 1.0 / np.prod(diff, axis=1)
@@ -71,3 +71,211 @@ class MomentTensor:
         """
         import pyawp
         pyawp.source.write(filename, self.stack(), self.pos)
+
+
+class MomentTensors:
+
+    def __init__(self, nsrc=0, nst=0, M=None, pos=None):
+        """
+        The MomentTensors class holds the moment tensors of many sources (e.g.,
+        the subfaults of a finite fault) in contiguous arrays.
+
+        Parameters
+
+        nsrc : int, optional,
+               Number of sources (ignored if `M` is given).
+        nst : int, optional,
+              Number of time steps (ignored if `M` is given).
+          M : np.array, size `nsrc x 6 x nst`, optional,
+              Moment tensor components of each source, stacked in the same
+              order as `MomentTensor.stack()`. Defaults to zero.
+        pos : np.array, size `nsrc x 3`, optional,
+              Position of each source. Defaults to zero.
+
+        `MomentTensors[i]` gives a `MomentTensor` that is a view of source `i`.
+        Indexing with a slice or an array of indices gives a new
+        `MomentTensors` for the selected sources (for a slice, its arrays are
+        views of the arrays of this object). The operations below modify `M`
+        in place, so that they also apply to the arrays it is a view of.
+
+        """
+        import numpy as np
+
+        if M is None:
+            M = np.zeros((nsrc, 6, nst))
+        self.M = np.asarray(M)
+        nsrc = self.M.shape[0]
+
+        if pos is None:
+            pos = np.zeros((nsrc, 3))
+        pos = np.asarray(pos)
+        if pos.dtype != np.int32:
+            pos = pos.astype(np.int32)
+        self.pos = pos.reshape((nsrc, 3))
+
+    def __len__(self):
+        return self.M.shape[0]
+
+    def __getitem__(self, i):
+        import numpy as np
+        if not isinstance(i, (int, np.integer)):
+            return MomentTensors(M=self.M[i], pos=self.pos[i])
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError("source index out of range")
+        return MomentTensorView(self, int(i))
+
+    def __setitem__(self, i, mt):
+        if isinstance(mt, MomentTensors):
+            self.M[i] = mt.M
+        else:
+            self.M[i] = mt.stack()
+        self.pos[i] = mt.pos
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def nst(self):
+        return self.M.shape[2]
+
+    def set_time_functions(self, stf, m):
+        """
+        Set the moment tensors to `m_ij * stf(t)` for each source.
+
+        Parameters
+
+        stf : np.array, size `nsrc x nst`,
+              Source time function of each source (e.g., obtained from
+              `sourcefcns.ricker_batch`).
+          m : np.array, size `6` or `nsrc x 6`,
+              Moment tensor components (mxx, myy, mzz, mxy, mxz, myz) shared
+              by all sources, or one set of components per source.
+
+        If `nst` changes, `M` is reallocated. This is not possible when `M`
+        is a view (e.g., of a slice) and raises a `ValueError`.
+
+        """
+        import numpy as np
+        m = np.broadcast_to(m, (len(self), 6))
+        M = m[:, :, None] * np.asarray(stf)[:, None, :]
+        if M.shape == self.M.shape:
+            self.M[...] = M
+        elif self.M.base is not None:
+            raise ValueError("Cannot change the number of time steps (%d -> "
+                             "%d) of a view" % (self.nst, M.shape[2]))
+        else:
+            self.M = M
+
+    def scale(self, factor):
+        """
+        Scale the moment tensors by `factor` (scalar, or one value per
+        source).
+
+        """
+        import numpy as np
+        factor = np.asarray(factor)
+        if factor.ndim == 1:
+            factor = factor[:, None, None]
+        self.M *= factor
+
+    def rotate(self, R):
+        """
+        Rotate the moment tensors, M' = R M R^T.
+
+        Parameters
+
+        R : np.array, size `3 x 3`, or `nsrc x 3 x 3`, 
+            Rotation matrix (or one rotation matrix per source). The rows of
+            the rotation matrix are the rotated coordinate axes (see
+            `rotate.tensor_xz`).
+
+        """
+        import numpy as np
+        R = np.asarray(R)
+        ii = [0, 1, 2, 0, 0, 1]
+        jj = [0, 1, 2, 1, 2, 2]
+        # Coefficients C[p, q] that give component p of the rotated tensor
+        # from component q of the tensor in Voigt notation
+        a = R[..., ii, :]
+        b = R[..., jj, :]
+        C = a[..., ii] * b[..., jj]
+        C[..., 3:] += a[..., jj[3:]] * b[..., ii[3:]]
+        if C.ndim == 2:
+            self.M[...] = np.einsum('pq,sqt->spt', C, self.M)
+        else:
+            self.M[...] = np.einsum('spq,sqt->spt', C, self.M)
+
+    def shift(self, t, dt):
+        """
+        Delay the moment tensors by `t` (scalar, or one value per source),
+        rounded to the nearest multiple of the time step `dt`. The time
+        steps before the onset are set to zero.
+
+        """
+        import numpy as np
+        n = np.rint(np.asarray(t) / dt).astype(np.int64)
+        n = np.broadcast_to(n, (len(self),))
+        idx = np.arange(self.nst)[None, :] - n[:, None]
+        valid = (idx >= 0) & (idx < self.nst)
+        idx = np.clip(idx, 0, self.nst - 1)
+        M = np.take_along_axis(self.M, idx[:, None, :], axis=2)
+        self.M[...] = np.where(valid[:, None, :], M, 0)
+
+    def write(self, filename, prec=None, chunk_size=1024):
+        """ 
+        Write all moment tensors to disk in the AWP source format (see
+        `source.write`).
+
+        """
+        import numpy as np
+        import pyawp
+        dtype = pyawp.source.record_dtype(self.nst, prec)
+        with open(filename, mode='wb') as fh:
+            for first in range(0, len(self), chunk_size):
+                last = min(first + chunk_size, len(self))
+                rec = np.zeros(last - first, dtype=dtype)
+                rec['pos'] = self.pos[first:last]
+                rec['M'] = self.M[first:last].transpose((0, 2, 1))
+                rec.tofile(fh)
+
+
+def component(c):
+    """
+    Property that accesses component `c` of a moment tensor view.
+    """
+    def get(self):
+        return self.tensors.M[self.index, c]
+
+    def set(self, value):
+        self.tensors.M[self.index, c] = value
+
+    return property(get, set)
+
+
+class MomentTensorView(MomentTensor):
+    """
+    Moment tensor that is a view of one source in `MomentTensors`. Modifying
+    the view modifies the underlying arrays.
+    """
+
+    xx = component(0)
+    yy = component(1)
+    zz = component(2)
+    xy = component(3)
+    xz = component(4)
+    yz = component(5)
+
+    def __init__(self, tensors, index):
+        self.tensors = tensors
+        self.index = index
+
+    @property
+    def pos(self):
+        return self.tensors.pos[self.index]
+
+    @pos.setter
+    def pos(self, value):
+        self.tensors.pos[self.index] = value
@@ -35,49 +35,194 @@ def load(filename, num_outputs=1, dt=1, dtype=None, verbose=True):
 
     return t, out
 
-def load_selected(filename, length, selection=[], dtype=None, verbose=True):
+def load_window(filename, t0, t1, num_outputs=1, dt=1, selection=None,
+                dtype=None, verbose=True):
+    """
+    Load the time window `t0 <= t < t1` from binary file without reading the
+    rest of the file.
+
+    Args:
+        filename: name of binary file to load
+        t0, t1: Start and end time of the window.
+        num_outputs: Number of outputs stored in the file.
+        dt: Time step
+        selection: a list of indices to load from the file. Defaults to all
+            outputs.
+        dtype: Data type stored in the binary file. Defaults to `np.float32`
+        verbose: print load message.
+
+    Returns:
+        t : Time vector of the window.
+        out : np.array of size length of window x number of outputs.
+
+    """
+    data = memmap_outputs(filename, num_outputs, dtype)
+    first = max(int(np.ceil(t0 / dt - 1e-6)), 0)
+    last = min(max(int(np.ceil(t1 / dt - 1e-6)), first), data.shape[1])
+    out = read_steps(data, first, last, selection)
+
+    if verbose:
+        print("Read: %s window [%g, %g) containing %d output(s)" % (filename,
+              t0, t1, out.shape[1]))
+
+    return dt * np.arange(first, last), out
+
+def load_blocks(filename, block_size, num_outputs=1, dt=1, selection=None,
+                dtype=None):
+    """
+    Iterate over a binary file in blocks of `block_size` time steps. Only one
+    block is kept in memory at a time.
+
+    Args:
+        filename: name of binary file to load
+        block_size: Number of time steps in each block.
+        num_outputs: Number of outputs stored in the file.
+        dt: Time step
+        selection: a list of indices to load from the file. Defaults to all
+            outputs.
+        dtype: Data type stored in the binary file. Defaults to `np.float32`
+
+    Yields:
+        t : Time vector of the block.
+        out : np.array of size block_size x number of outputs (the last block
+            can be shorter).
+
+    """
+    data = memmap_outputs(filename, num_outputs, dtype)
+    outlen = data.shape[1]
+    for first in range(0, outlen, block_size):
+        last = min(first + block_size, outlen)
+        yield dt * np.arange(first, last), read_steps(data, first, last,
+                                                      selection)
+
+def memmap_outputs(filename, num_outputs=1, dtype=None):
+    """
+    Memory map binary file that contains `num_outputs` outputs stored one after
+    another.
+
+    Returns:
+        np.memmap : Array of size num_outputs x length of each output.
+
+    """
+    if not dtype:
+        dtype = np.float32
+
+    data = np.memmap(filename, dtype=dtype, mode='r')
+    outlen = len(data)
+    if outlen % num_outputs != 0:
+        raise ValueError("num_outputs = %d is not divisible by len(output) = "\
+                "%d." % (num_outputs, outlen))
+    return data.reshape((num_outputs, outlen // num_outputs))
+
+def read_steps(data, first, last, selection=None):
+    """
+    Read the time steps `first` to `last` (exclusive) of the selected outputs
+    from a memory mapped file (see `memmap_outputs`).
+
+    Returns:
+        np.array : Array of size last - first x number of selected outputs.
+
+    """
+    if selection is None:
+        return np.array(data[:, first:last].T)
+    selection = np.asarray(selection, dtype=np.int64).ravel()
+    order = np.argsort(selection, kind='stable')
+    out = np.zeros((last - first, len(selection)), dtype=data.dtype)
+    out[:, order] = data[selection[order], first:last].T
+    return out
+
+def load_selected(filename, length, selection=[], dtype=None, verbose=True,
+                  out_dtype=None, threads=None):
     """
     Load a selected number of outputs from binary file. 
 
+    The selected outputs are sorted and grouped into runs of consecutive
+    outputs, and each run is read using a single read from a memory map of the
+    file.
+
     Args:
         filename: name of binary file to load
         length: length of each output in counts (number of steps saved)
         selection: a list of indices to load from the file.
         dtype: Data type stored in the binary file. Defaults to `np.float32`
         verbose: print load message.
+        out_dtype: Data type of the returned array. Defaults to `dtype`.
+        threads: Number of threads to read the runs on.
+
+    Returns:
+        np.array : Array of size length x number of selected outputs.
 
     """
     if not dtype:
         dtype = np.float32
+    if not out_dtype:
+        out_dtype = dtype
 
+    selection = np.asarray(selection, dtype=np.int64).ravel()
     num_outputs = len(selection)
-    out = np.zeros((length, num_outputs))
-
-    i = 0
-    for idx in selection:
-        offset = np.dtype(dtype).itemsize * length * idx
-        data = np.fromfile(filename, dtype=dtype, count=length, offset=offset)
-        out[:, i] = data
-        i += 1
+    out = np.zeros((length, num_outputs), dtype=out_dtype)
+    if num_outputs == 0:
+        return out
+
+    data = np.memmap(filename, dtype=dtype, mode='r')
+    order = np.argsort(selection, kind='stable')
+    indices = selection[order]
+
+    def read(run):
+        first, last = run
+        start = indices[first]
+        count = last - first
+        block = data[start * length:(start + count) * length]
+        out[:, order[first:last]] = block.reshape((count, length)).T
+
+    runs = contiguous_runs(indices)
+    if threads:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(read, runs))
+    else:
+        for run in runs:
+            read(run)
     
     if verbose:
         print("Read: %s selecting %s output(s)" % (filename, num_outputs))
 
     return out
 
+def contiguous_runs(indices):
+    """
+    Group sorted indices into runs of consecutive indices.
+
+    Args:
+        indices: Sorted array of indices.
+
+    Returns:
+        list : Pairs `(first, last)` so that `indices[first:last]` is a run of
+            consecutive indices.
+
+    """
+    breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+    bounds = np.concatenate(([0], breaks, [len(indices)]))
+    return list(zip(bounds[:-1], bounds[1:]))
+
 
 def load_all(filename, fields, refine=0, frame=1, num_outputs=1, dt=1,
-             coarsen=1, dtype=None):
+             coarsen=1, dtype=None, threads=None):
     """
     Load all files that follow a special naming
     convention: 'filename_field_refine_frame'.
 
+    The fields are loaded concurrently. When coarsening, only every
+    `2 ** refine` time step is copied out of the file.
+
     Args:
         filename: Name of the file.
         refine: Refinement number (starts at 0 for no refinement).
         frame: Number of frames in output.
         dt: Time step
         coarsen: Adjust output length so that it matches refinement 0.
+        threads: Number of threads to load fields on. Defaults to one thread
+            per field.
     
     Example:
         load_all('output', 'x y z') loads
@@ -91,41 +236,81 @@ def load_all(filename, fields, refine=0, frame=1, num_outputs=1, dt=1,
         the order specified.
 
     """
+    from concurrent.futures import ThreadPoolExecutor
     frame_ref = frame * 2 ** refine
     dt_ref = dt / 2 ** refine
-    out = []
-    first = 1
-    for field in fields.split(' '):
-        t, v = load('%s_%d_%s_0%d' % (filename, refine, field, frame_ref),
-                    num_outputs, dt_ref)
-        if coarsen:
-            t = t[::2 ** refine]
-            v = v[::2 ** refine]
-
-        if first:
-            out.append(t)
-            first = 0
+    stride = 2 ** refine if coarsen else 1
+    fields = fields.split(' ')
+
+    def load_field(field):
+        fieldname = '%s_%d_%s_0%d' % (filename, refine, field, frame_ref)
+        data = memmap_outputs(fieldname, num_outputs, dtype)
+        print("Read: %s containing %s output(s)" % (fieldname, num_outputs))
+        t = time(data.shape[1], dt_ref)[::stride]
+        return t, np.array(data[:, ::stride].T)
+
+    if not threads:
+        threads = len(fields)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        loaded = list(executor.map(load_field, fields))
+
+    out = [loaded[0][0]]
+    for t, v in loaded:
         out.append(v)
     return out
 
-def load_edge_2d(path, name):
+def load_edge_2d(path, name, cache=True):
     from pyawp import Struct
-    d = np.genfromtxt('%s/%s'%(path, name), delimiter=',')
+    d = load_columns('%s/%s'%(path, name), (0, 1, 4, 5), cache=cache)
     data = Struct()
     data.t = d[:,0]
     data.p = d[:,1]
-    data.vy = d[:,4]
-    data.vz = d[:,5]
+    data.vy = d[:,2]
+    data.vz = d[:,3]
     return data
 
-def load_edge_3d(path, name):
+def load_edge_3d(path, name, cache=True):
     from pyawp import Struct
-    d = np.genfromtxt('%s/%s'%(path, name), delimiter=',')
+    d = load_columns('%s/%s'%(path, name), (0, 7, 8, 9), skiprows=1,
+                     cache=cache)
     data = Struct()
-    data.t = d[1:,0]
-    data.vx = d[1:,7]
-    data.vy = d[1:,8]
-    data.vz = d[1:,9]
+    data.t = d[:,0]
+    data.vx = d[:,1]
+    data.vy = d[:,2]
+    data.vz = d[:,3]
     return data
 
+def load_columns(filename, usecols, skiprows=0, delimiter=',', cache=True):
+    """
+    Load selected columns from a CSV file. 
+
+    Only the selected columns are parsed. If `cache` is enabled, the parsed
+    columns are saved to a binary file next to the CSV file (e.g.,
+    'filename.0-7-8-9.npy' for the columns 0, 7, 8, 9) that is loaded instead
+    of the CSV file as long as the CSV file has not been modified.
+
+    Args:
+        filename: name of CSV file to load
+        usecols: Indices of the columns to load.
+        skiprows: Number of header lines to skip.
+        delimiter: Column delimiter.
+        cache: Load and save the binary copy.
+
+    Returns:
+        np.array : Array of size number of rows x len(usecols).
+
+    """
+    import os
+    cachefile = '%s.%s.npy' % (filename, '-'.join([str(c) for c in usecols]))
+    if cache and os.path.exists(cachefile) and \
+       os.path.getmtime(cachefile) >= os.path.getmtime(filename):
+        return np.load(cachefile)
 
+    d = np.loadtxt(filename, delimiter=delimiter, usecols=usecols,
+                   skiprows=skiprows, ndmin=2)
+    if cache:
+        try:
+            np.save(cachefile, d)
+        except OSError:
+            pass
+    return d
@@ -5,6 +5,11 @@ Module for working with SGT data from Rob Graves' RWG code.
 import os
 import numpy as np
 
+# Component order and signs that convert RWG SGTs to AWP SGTs (see `rwgtoawp`)
+RWG_TO_AWP = np.array([1, 0, 2, 3, 5, 4])
+RWG_TO_AWP_SIGN = np.array([1, 1, 1, 1, -1, -1], dtype=np.float32)
+
+
 def fromrsgtfile(filename, sgt_index, nt):
     ncomp = 6
     float_bytes = 4
@@ -18,21 +23,64 @@ def fromrsgtfile(filename, sgt_index, nt):
     return sgt
 
 
-def rwgtoawp(sgt):
-    # Convert to AWP format
-    # Swaps XX and YY, XZ and YZ, multiplies XZ and YZ by -1
-    awp_sgt = sgt.copy()
-
-    xx = sgt[:,0]
-    yy = sgt[:,1]
-    zz = sgt[:,2]
-    xy = sgt[:,3]
-    xz = sgt[:,4]
-    yz = sgt[:,5]
-    
-    awp_sgt[:,0] = yy
-    awp_sgt[:,1] = xx
-    awp_sgt[:,4] = -yz
-    awp_sgt[:,5] = -xz
-
-    return awp_sgt
+def fromrsgtfile_batch(filename, sgt_indices, nt, awp=False):
+    """
+    Extract many SGTs from a RSGT file in one pass over a memory map of the
+    file.
+
+    Args:
+        filename: RSGT file to read.
+        sgt_indices: Array of SGT indices to extract.
+        nt: Number of time steps per SGT.
+        awp(optional): Convert the SGTs to AWP format (see `rwgtoawp`) while
+            reading.
+
+    Returns:
+        sgt: Array of size number of indices x nt x 6.
+
+    """
+    ncomp = 6
+    sgt_indices = np.asarray(sgt_indices, dtype=np.int64).ravel()
+    data = np.memmap(filename, dtype=np.float32, mode='r')
+    data = data[:data.shape[0] // (ncomp * nt) * ncomp * nt]
+    data = data.reshape((-1, ncomp, nt))
+    # Fancy indexing the memory map reads the SGTs into a single in-memory copy
+    if not awp:
+        return np.asarray(data[sgt_indices]).transpose((0, 2, 1))
+
+    sgt = np.asarray(data[sgt_indices[:,None], RWG_TO_AWP[None,:]])
+    sgt *= RWG_TO_AWP_SIGN[None,:,None]
+    return sgt.transpose((0, 2, 1))
+
+
+def rwgtoawp(sgt, inplace=False):
+    """
+    Convert SGTs from RWG format to AWP format.
+    Swaps XX and YY, XZ and YZ, multiplies XZ and YZ by -1
+
+    Args:
+        sgt: SGT components stored along the last axis, e.g., an array of
+            size nt x 6 or number of SGTs x nt x 6.
+        inplace(optional): Overwrite `sgt` instead of returning a copy.
+
+    Returns:
+        SGT in AWP format (the same array as `sgt` if `inplace = True`).
+
+    Notes:
+        Instead of converting the SGTs, it is also possible to keep them in
+        RWG format and convert the (much smaller) moment tensor in the same way
+        (see `sgt.compute_velocity`).
+
+    """
+    if not inplace:
+        awp_sgt = sgt[..., RWG_TO_AWP]
+        awp_sgt *= RWG_TO_AWP_SIGN.astype(awp_sgt.dtype)
+        return awp_sgt
+
+    xx = sgt[..., 0].copy()
+    sgt[..., 0] = sgt[..., 1]
+    sgt[..., 1] = xx
+    xz = sgt[..., 4].copy()
+    np.negative(sgt[..., 5], out=sgt[..., 4])
+    np.negative(xz, out=sgt[..., 5])
+    return sgt
@@ -3,6 +3,10 @@
 Module for handling SGTs (strain Green tensor's) and reciprocity
 
 """
+import numpy as np
+
+# Weights of the moment tensor components in Voigt notation
+VOIGT_WEIGHTS = np.array([1, 1, 1, 2, 2, 2])
 
 def stresses_to_strains(sxx, syy, szz, sxy, sxz, syz, lami, mui):
     """
@@ -57,7 +61,82 @@ def strains_to_stresses(exx, eyy, ezz, exy, exz, eyz, lam, mu):
 
     return sxx, syy, szz, sxy, sxz, syz
 
-def compute_velocity(mij, Gij):
+def stresses_to_strains_stacked(s, lami, mui, out=None, chunk_size=2**16):
+    """
+    Convert stresses to strains for stacked stress tensor components (see
+    `stresses_to_strains`).
+
+    The conversion is performed in chunks of time steps without allocating
+    any full-size temporary arrays.
+
+    Args:
+        s: Stress tensor components, np.array of size 6 x nt x nr, stacked
+            as xx, yy, zz, xy, xz, yz.
+        lami: 1 / Lame`s first parameter, np.array of size 1 x nr,
+        mui: 1 / shear modulus, np.array of size 1 x nr,
+        out(optional): Array to write the strains to (same size as `s`). Can be
+            `s` itself.
+        chunk_size(optional): Approximate number of values per component to
+            process at a time.
+
+    Returns:
+        Strain tensor components (same size as `s`).
+
+    """
+    lam = 1.0 / lami
+    alpha = 0.5 * mui * lam / (3 * lam + 2.0 / mui)
+    return isotropic_map(s, 0.5 * mui, -alpha, 0.5 * mui, out, chunk_size)
+
+def strains_to_stresses_stacked(e, lam, mu, out=None, chunk_size=2**16):
+    """
+    Convert strains to stresses for stacked strain tensor components (see
+    `strains_to_stresses` and `stresses_to_strains_stacked`).
+
+    Args:
+        e: Strain tensor components, np.array of size 6 x nt x nr.
+        lam: Lame`s first parameter
+        mu: shear modulus
+        out(optional): Array to write the stresses to (same size as `e`). Can
+            be `e` itself.
+        chunk_size(optional): Approximate number of values per component to
+            process at a time.
+
+    Returns:
+        Stress tensor components (same size as `e`).
+
+    """
+    return isotropic_map(e, 2 * mu, lam, 2 * mu, out, chunk_size)
+
+def isotropic_map(u, diag, trace, shear, out=None, chunk_size=2**16):
+    """
+    Apply the map 
+
+        v_ii = diag * u_ii + trace * (u_xx + u_yy + u_zz),
+        v_ij = shear * u_ij, i != j
+
+    to stacked tensor components `u` (6 x nt x nr), in chunks of time steps.
+
+    """
+    if out is None:
+        out = np.empty_like(u)
+    nt = u.shape[1]
+    nr = int(np.prod(u.shape[2:]))
+    step = max(chunk_size // max(nr, 1), 1)
+    buf = np.empty((step,) + u.shape[2:], dtype=np.result_type(u, diag, trace))
+    for first in range(0, nt, step):
+        last = min(first + step, nt)
+        tr = buf[:last - first]
+        np.add(u[0, first:last], u[1, first:last], out=tr)
+        tr += u[2, first:last]
+        tr *= trace
+        for i in range(3):
+            np.multiply(u[i, first:last], diag, out=out[i, first:last])
+            out[i, first:last] += tr
+        for i in range(3, 6):
+            np.multiply(u[i, first:last], shear, out=out[i, first:last])
+    return out
+
+def compute_velocity(mij, Gij, rwg=False):
     """
 
     Determine the velocity field from the moment tensor components mij and
@@ -67,6 +146,10 @@ def compute_velocity(mij, Gij):
     Args:
         mij: List of Moment tensor components in Voigt notation (see Notes)
         Gij: List of Moment tensor components in Voigt notation (see Notes)
+        rwg(optional): Set to `True` if the strain Green's tensor is in RWG
+            format. Instead of converting the strain Green's tensor to AWP
+            format, the moment tensor is converted to RWG format, which gives
+            the same result (see `rsgt.rwgtoawp`).
 
 
     Notes:
@@ -74,6 +157,75 @@ def compute_velocity(mij, Gij):
             xx, yy, zz, xy, xz, yz.
 
     """
+    if rwg:
+        from pyawp.rsgt import RWG_TO_AWP, RWG_TO_AWP_SIGN
+        mij = [RWG_TO_AWP_SIGN[i] * mij[RWG_TO_AWP[i]] for i in range(6)]
 
     return  (mij[0] * Gij[0] + mij[1] * Gij[1] + mij[2] * Gij[2]
           +  2 * mij[3] * Gij[3] + 2 * mij[4] * Gij[4] + 2 * mij[5] * Gij[5])
+
+def compute_velocities(mij, Gij, slip_rate=None, dt=1.0, rwg=False,
+                       total=False, chunk_size=1024):
+    """
+    Determine the velocity for many sources at once (see `compute_velocity`).
+
+    The sources are processed in chunks of `chunk_size` sources at a time to
+    bound the memory usage.
+
+    Args:
+        mij: Moment tensor components in Voigt notation, array of size nsrc x
+            6 x nt (or nsrc x 6 for time-independent moment tensors).
+        Gij: Strain Green's tensors, array of size nsrc x nt x 6 (e.g.,
+            obtained from `rsgt.fromrsgtfile_batch`).
+        slip_rate(optional): Slip rate functions to convolve the velocity of
+            each source with, array of size nsrc x nts. The convolution is
+            computed using FFTs and truncated to `nt` time steps.
+        dt(optional): Time step used to scale the convolution.
+        rwg(optional): Set to `True` if the strain Green's tensors are in RWG
+            format (see `compute_velocity`).
+        total(optional): Return the sum of the velocities of all sources.
+        chunk_size(optional): Number of sources to process at a time.
+
+    Returns:
+        np.array : Velocity of each source (nsrc x nt), or the total velocity
+            (nt) if `total = True`.
+
+    """
+    mij = np.asarray(mij)
+    if mij.ndim == 2:
+        mij = mij[:,:,None]
+    nsrc, nt = Gij.shape[0], Gij.shape[1]
+    weights = VOIGT_WEIGHTS
+    if rwg:
+        from pyawp.rsgt import RWG_TO_AWP, RWG_TO_AWP_SIGN
+        weights = VOIGT_WEIGHTS * RWG_TO_AWP_SIGN
+
+    if total:
+        out = np.zeros((nt,))
+    else:
+        out = np.zeros((nsrc, nt))
+
+    for first in range(0, nsrc, chunk_size):
+        last = min(first + chunk_size, nsrc)
+        m = mij[first:last]
+        if rwg:
+            m = m[:, RWG_TO_AWP, :]
+        v = np.einsum('sct,stc,c->st', m, Gij[first:last], weights)
+        if slip_rate is not None:
+            v = convolve(v, slip_rate[first:last], nt) * dt
+        if total:
+            out += np.sum(v, axis=0)
+        else:
+            out[first:last] = v
+    return out
+
+def convolve(u, v, nt):
+    """
+    Convolve each row of `u` with the same row of `v` using FFTs, and keep the
+    first `nt` time steps.
+
+    """
+    n = u.shape[-1] + v.shape[-1] - 1
+    nfft = 1 << (n - 1).bit_length()
+    out = np.fft.irfft(np.fft.rfft(u, nfft) * np.fft.rfft(v, nfft), nfft)
+    return out[..., :nt]
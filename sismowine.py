@@ -7,48 +7,70 @@ http://www.sismowine.org/index.html?page=sol_for
 import numpy as np
 
 
-def read(filename, record_skip=2):
+def read(filename, record_skip=2, selection=None):
     """
     Read sismowine solution file.
 
     Args:
         filename : Name of solution file to read.
+        record_skip(optional) : Number of empty lines between two records.
+        selection(optional) : List of receiver indices to read. Only the
+            records of the selected receivers are parsed. Defaults to all
+            receivers.
 
     Returns:
         time : Time vector
         solutions : List of solution array (`np.array`). 
 
     """
-    f = open(filename).read().split('\n')
-    nt, dt, nr = f[0].strip().split(' ')
-    nt = int(nt[0:])
+    with open(filename) as fh:
+        header = fh.readline()
+        body = fh.read()
+    nt, dt, nr = header.strip().lstrip('#').split()
+    nt = int(nt)
     dt = float(dt)
     nr = int(nr)
-    solutions = [0]*nr
-    skip = 0
-    for i in range(nr):
-        solutions[i] = np.array(f[1 + skip + nt * i: 1 +
-                                skip + nt * (i + 1)]).astype(np.float64)
-        # Each new data record comes after two empty lines
-        skip += record_skip
-    time = [dt * i for i in range(nt)]
+
+    if selection is None:
+        values = np.fromstring(body, sep=' ')
+        if len(values) != nt * nr:
+            raise ValueError("Expected %d values but found %d in %s" %
+                             (nt * nr, len(values), filename))
+        solutions = list(values.reshape((nr, nt)))
+    else:
+        lines = body.split('\n')
+        solutions = [0]*len(selection)
+        for i, idx in enumerate(selection):
+            if idx < 0 or idx >= nr:
+                raise IndexError("Receiver index %d is out of range for %d "\
+                                 "receiver(s) in %s" % (idx, nr, filename))
+            # Each new data record comes after `record_skip` empty lines
+            first = (nt + record_skip) * idx
+            solutions[i] = np.fromstring('\n'.join(lines[first:first + nt]),
+                                         sep=' ')
+            if len(solutions[i]) != nt:
+                raise ValueError("Expected %d values but found %d for "\
+                                 "receiver %d in %s" % (nt,
+                                 len(solutions[i]), idx, filename))
+    time = dt * np.arange(nt)
     return solutions, time
 
 
-def write(filename, solutions, dt):
+def write(filename, solutions, dt, block_size=100):
     """
     Write sismowine solution file.
 
     Args:
         filename : Name of the solution file to write.
         solutions : List of solution arrays (`np.array`). 
+        block_size(optional) : Number of solutions to format at a time.
 
     """
     nr = len(solutions)
-    f = open(filename, 'w')
     nt = len(solutions[0])
-    f.write('#%d %g %d\n' % (nt, dt, nr))
-    for i in range(nr):
-        f.write('\n'.join(['%e' % si for si in solutions[i]]))
-        f.write('\n\n\n')
-
+    record = '%e\n' * nt + '\n\n'
+    with open(filename, 'w') as f:
+        f.write('#%d %g %d\n' % (nt, dt, nr))
+        for i in range(0, nr, block_size):
+            block = np.array(solutions[i:i + block_size], dtype=np.float64)
+            f.write(record * block.shape[0] % tuple(block.ravel().tolist()))
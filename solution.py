@@ -22,28 +22,105 @@ def print_difference(field, u, v, relative=0):
         print("%e \t %e \t %e"% (e1, e2, einf))
     return err
 
-def norm(u, v, relative=0):
+def norm(u, v, relative=0, chunk_size=2**20, threads=None, dtype=None):
     """
 
     Compute the norm difference \| u - v\| using the 1-norm, 2-norm, and
     infinity norm. If `relative = 0` then the norm is normalized by `\| u|`.
 
+    The arrays are treated as vectors and each pair `(u[i], v[i])` is processed
+    in a single pass over chunks of `chunk_size` values, so that memory mapped
+    arrays are never fully loaded. The pairs are processed in parallel on
+    `threads` threads.
+
+    Args:
+        u, v: Lists of arrays (or names of binary files) to compare, one per
+            refinement level.
+        relative(optional): Normalize the norms by the norms of `u`.
+        chunk_size(optional): Number of values to process at a time.
+        threads(optional): Number of threads. Defaults to one thread per pair.
+        dtype(optional): Data type of binary files. Defaults to `np.float32`.
+
+    Returns:
+        Struct : Norms `e1`, `e2`, `inf` (relative if `relative = 1`), the
+            relative norms `e1_rel`, `e2_rel`, `inf_rel`, and `table`, a
+            structured array that contains all of the norms for each
+            refinement level.
+
     """
-    import pyawp
+    from concurrent.futures import ThreadPoolExecutor
     import numpy as np
-    err = init_fields('e1 e2 inf', num_refine=len(u))
-    i = 0
-    for ui, vi in zip(u, v):
-        ui = ui.squeeze()
-        vi = vi.squeeze()
-        err.e2[i] = np.linalg.norm(ui - vi, ord=2)
-        err.e1[i] = np.linalg.norm(ui - vi, ord=1)
-        err.inf[i] = np.max(np.abs(ui - vi))
-        if relative:
-           err.e2[i]  = err.e2[i] / np.linalg.norm(ui, ord=2)
-           err.e1[i]  = err.e1[i] / np.linalg.norm(ui, ord=1)
-           err.inf[i] = err.inf[i] / np.max(np.abs(ui))
-        i += 1
+
+    def pair_norms(pair):
+        return norms(load_vector(pair[0], dtype), load_vector(pair[1], dtype),
+                     chunk_size)
+
+    pairs = list(zip(u, v))
+    if not threads:
+        threads = max(len(pairs), 1)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(pair_norms, pairs))
+
+    names = ['e1', 'e2', 'inf', 'e1_rel', 'e2_rel', 'inf_rel']
+    table = np.zeros(len(results), dtype=[('level', np.int64)] + 
+                                          [(name, np.float64) 
+                                           for name in names])
+    for i, res in enumerate(results):
+        table[i]['level'] = i
+        table[i]['e1'] = res[0]
+        table[i]['e2'] = res[1]
+        table[i]['inf'] = res[2]
+        # The relative norms are `nan` or `inf` if `u` is zero
+        with np.errstate(divide='ignore', invalid='ignore'):
+            table[i]['e1_rel'] = np.divide(res[0], res[3])
+            table[i]['e2_rel'] = np.divide(res[1], res[4])
+            table[i]['inf_rel'] = np.divide(res[2], res[5])
+
+    err = init_fields(' '.join(names), num_refine=len(results))
+    for name in names:
+        err[name] = list(table[name])
+    if relative:
+        err.e1 = err.e1_rel
+        err.e2 = err.e2_rel
+        err.inf = err.inf_rel
+    err.table = table
     return err
 
+def norms(u, v, chunk_size=2**20):
+    """
+
+    Compute |u - v|_1, |u - v|_2, |u - v|_inf, |u|_1, |u|_2, and |u|_inf
+    in a single pass over chunks of the vectors `u` and `v`.
+
+    """
+    import numpy as np
+    if u.shape[0] != v.shape[0]:
+        raise ValueError("Size mismatch: %d != %d" % (u.shape[0], v.shape[0]))
+
+    e1 = e2 = einf = u1 = u2 = uinf = np.float64(0.0)
+    for first in range(0, u.shape[0], chunk_size):
+        ui = np.asarray(u[first:first + chunk_size], dtype=np.float64)
+        d = np.subtract(ui, v[first:first + chunk_size], dtype=np.float64)
+        e2 += np.dot(d, d)
+        u2 += np.dot(ui, ui)
+        np.abs(d, out=d)
+        np.abs(ui, out=ui)
+        e1 += np.sum(d)
+        u1 += np.sum(ui)
+        if d.shape[0] > 0:
+            einf = np.maximum(einf, np.max(d))
+            uinf = np.maximum(uinf, np.max(ui))
+    return e1, np.sqrt(e2), einf, u1, np.sqrt(u2), uinf
 
+def load_vector(u, dtype=None):
+    """
+    Return `u` as a 1D array. If `u` is a filename, then the file is memory
+    mapped.
+
+    """
+    import numpy as np
+    if isinstance(u, str):
+        if not dtype:
+            dtype = np.float32
+        return np.memmap(u, dtype=dtype, mode='r')
+    return np.asarray(u).reshape(-1)
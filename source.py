@@ -6,6 +6,11 @@ class Source(object):
     """
     This class is used for creating old-style AWP sources and writing them to
     disk.
+
+    The sources are stored in `sources`, a `MomentTensors` container (this
+    used to be a list of `MomentTensor` objects). `sources[i]` gives a
+    `MomentTensor` view of source `i`, and slicing or indexing with an array
+    gives a `MomentTensors` container of the selected sources.
     """
 
     def __init__(self, config, **kwargs):
@@ -24,30 +29,34 @@ class Source(object):
             self.settings[arg] = kwargs[arg]
 
     def init_sources(self):
-        mxx = np.zeros((self.settings.nst,))
-        myy = np.zeros((self.settings.nst,))
-        mzz = np.zeros((self.settings.nst,))
-        mxy = np.zeros((self.settings.nst,))
-        mxz = np.zeros((self.settings.nst,))
-        myz = np.zeros((self.settings.nst,))
-        sources = [0]*self.num_sources
-        for i in range(self.settings.nsrc): 
-            sources[i] = pyawp.MomentTensor(mxx, myy, mzz, mxy, mxz, myz) 
-        return sources
+        return pyawp.MomentTensors(self.num_sources, self.settings.nst)
 
     def file(self):
         return self.settings.filename + "_%d"% self.grid_num
 
-    def write(self):
-        overwrite = 1
+    def write(self, chunk_size=1024):
+        """
+        Write all sources to disk (see `write`). The records of `chunk_size`
+        sources at a time are assembled in memory and written using a single
+        file handle.
+
+        """
         if self.topo_auto_adjust:
             self.topo_adjust()
-        for src in self.sources:
-            write(self.file(), 
-                  src.stack(), np.array(src.pos), overwrite,
-                  prec=self.settings.prec)
-            if overwrite:
-                overwrite = 0
+        if isinstance(self.sources, pyawp.MomentTensors):
+            self.sources.write(self.file(), prec=self.settings.prec,
+                               chunk_size=chunk_size)
+            return
+        with open(self.file(), mode='wb') as fh:
+            for first in range(0, len(self.sources), chunk_size):
+                chunk = self.sources[first:first + chunk_size]
+                M = [src.stack() for src in chunk]
+                dtype = record_dtype(M[0].shape[1], self.settings.prec)
+                rec = np.zeros(len(chunk), dtype=dtype)
+                for i, src in enumerate(chunk):
+                    rec['pos'][i] = src.pos
+                    rec['M'][i] = M[i].transpose()
+                rec.tofile(fh)
 
     def info(self):
         for i in range(self.settings.nsrc): 
@@ -81,19 +90,76 @@ class Source(object):
     def num_sources(self):
         return self.settings.nsrc
 
-def read(filename):
-    import numpy as np
+def read(filename, index=0, nst=None, prec=None):
+    """
+    Read source from disk
+
+    Arguments:
+        filename : File to read from.
+        index : Index of the source to read.
+        nst : Number of time steps per source. If not specified, the file is
+            assumed to contain a single source.
+        prec : Precision of the moment tensor data. Defaults to `np.float32`.
+
+    Returns:
+        pos : Source position
+        out : Moment tensor, array of size 6 x nst (see
+            MomentTensor.stack())
+
+    """
+    rec = memmap(filename, nst, prec)[index]
+    return np.array(rec['pos']), np.array(rec['M']).transpose()
+
+def read_tensors(filename, nst, prec=None, index=None):
+    """
+    Read many sources from disk.
+
+    Arguments:
+        filename : File to read from.
+        nst : Number of time steps per source.
+        prec : Precision of the moment tensor data. Defaults to `np.float32`.
+        index : Indices (or slice) of the sources to read. Defaults to all
+            sources.
+
+    Returns:
+        MomentTensors
+
+    """
+    rec = memmap(filename, nst, prec)
+    if index is not None:
+        rec = rec[index]
+    return pyawp.MomentTensors(M=np.array(rec['M']).transpose((0, 2, 1)),
+                               pos=rec['pos'])
+
+def memmap(filename, nst=None, prec=None):
+    """
+    Memory map a source file as an array of source records (see
+    `record_dtype`). Use `rec[i]['pos']` and `rec[i]['M']` to access the
+    position and moment tensor (nst x 6) of source `i`.
+
+    Arguments:
+        filename : File to read from.
+        nst : Number of time steps per source. If not specified, the file is
+            assumed to contain a single source.
+        prec : Precision of the moment tensor data. Defaults to `np.float32`.
+
+    Returns:
+        np.memmap : Read-only array of source records.
+
+    """
     import os
 
-# Get source position
-    pos = np.fromfile(filename, count=3, dtype=np.int32)
-    fh = open(filename, mode='rb')
-    # Get source data
-    fh.seek(4*3, os.SEEK_SET)
-    M = np.fromfile(fh, dtype=np.float32)
-    out = np.reshape(M, (int(M.shape[0]/6), int(6))).transpose()
-    fh.close()
-    return pos, out
+    if not prec:
+        prec = np.float32
+    size = os.path.getsize(filename)
+    if nst is None:
+        nst = (size - 3 * 4) // (6 * np.dtype(prec).itemsize)
+    dtype = record_dtype(nst, prec)
+    if size % dtype.itemsize != 0:
+        raise ValueError("Size of %s (%d bytes) is not a multiple of the "\
+                         "record size (%d bytes) for nst = %d" % (filename,
+                         size, dtype.itemsize, nst))
+    return np.memmap(filename, dtype=dtype, mode='r')
 
 def write(filename, M, pos, overwrite=0, prec=None):
     """
@@ -125,17 +191,37 @@ def write(filename, M, pos, overwrite=0, prec=None):
 
 
 
-def write_source_input(filename, params, types, x, y, z, verbose=True):
+def record_dtype(nst, prec=None):
+    """
+    Data type of a source record in the binary source file format: the source
+    position (3 x int32) followed by the moment tensor (nst x 6, `prec`), in
+    which the six components are stored contiguously for each time step.
+
+    """
+    if not prec:
+        prec = np.float32
+    return np.dtype([('pos', np.int32, (3,)), ('M', prec, (nst, 6))])
+
+
+def write_source_input(filename, params, types, x, y, z, verbose=True,
+                       binary=False):
     write_input(filename, params, types, x, y, z, verbose=verbose,
-            is_source=True)
+            is_source=True, binary=binary)
 
-def write_recv_input(filename, params, types, x, y, z, verbose=True):
+def write_recv_input(filename, params, types, x, y, z, verbose=True,
+                     binary=False):
     write_input(filename, params, types, x, y, z, verbose=verbose,
-            is_source=False)
+            is_source=False, binary=binary)
 
-def write_input(filename, params, types, x, y, z, verbose=True, is_source=True):
+def write_input(filename, params, types, x, y, z, verbose=True, is_source=True,
+                binary=False, chunk_size=65536):
     """
     Write source or receiver configuration file
+
+    The coordinates are formatted `chunk_size` lines at a time. If `binary` is
+    enabled, the ASCII coordinates section is replaced by a 'binary
+    coordinates' section that contains one packed record per coordinate:
+    type (int32) followed by x, y, z (float64), see `coordinate_dtype`.
     """
 
     assert 'steps' in params
@@ -183,9 +269,25 @@ def write_input(filename, params, types, x, y, z, verbose=True, is_source=True):
         assert x.shape == y.shape
         assert x.shape == z.shape
         f.write('length=%d\n' % x.shape[0])
-        f.write('\ncoordinates\n')
-        for ti, xi, yi, zi in zip(types, x, y, z):
-            f.write("%d %f %f %f \n"% (ti, xi, yi, zi))
+        types = np.array(types)
+        n = min(types.shape[0], x.shape[0])
+        if binary:
+            f.write('\nbinary coordinates\n')
+            f.flush()
+            coords = np.zeros(n, dtype=coordinate_dtype())
+            coords['type'] = types[:n]
+            coords['x'] = x[:n]
+            coords['y'] = y[:n]
+            coords['z'] = z[:n]
+            coords.tofile(f.buffer)
+        else:
+            f.write('\ncoordinates\n')
+            for first in range(0, n, chunk_size):
+                last = min(first + chunk_size, n)
+                lines = np.column_stack((types[first:last], x[first:last],
+                                         y[first:last], z[first:last]))
+                f.write("%d %f %f %f \n" * (last - first) %
+                        tuple(lines.astype(np.float64).ravel().tolist()))
         if verbose:
             if is_source:
                 print("Wrote %d source(s): %s" % (x.shape[0], filename))
@@ -236,6 +338,16 @@ def write_force(filename, fx, fy, fz, verbose=True):
                     (filename))
 
 
+def coordinate_dtype():
+    """
+    Data type of a coordinate record in the binary coordinates section of a
+    source or receiver configuration file (see `write_input`).
+
+    """
+    return np.dtype([('type', np.int32), ('x', np.float64), ('y', np.float64),
+                     ('z', np.float64)])
+
+
 def resolution(max_frequency, gridspacing, min_wavespeed):
     """
     Determine the number of grid points per minimum wavelength.
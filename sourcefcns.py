@@ -31,3 +31,108 @@ def minimum_phase(T, t0, t):
         t : Time array
     """
     return np.exp(-t/T) * t / T**2
+
+# Batched source time functions
+#
+# The functions below evaluate one source time function per source. The
+# parameters are either scalars or arrays of length nsrc, and the output is an
+# array of size nsrc x nt (or nt if all parameters are scalars). The time
+# functions are delayed by the onset times `t0`.
+
+def delay(t0, t):
+    """
+    Time since onset `t - t0` for each onset time (nsrc x nt).
+    """
+    return np.asarray(t) - np.asarray(t0, dtype=np.float64)[..., None]
+
+def ricker_batch(fp, t0, t):
+    """
+    Ricker wavelets (see `ricker`).
+
+    Input arguments:
+        fp : Central frequencies
+        t0 : Time delays
+        t : Time array.
+    """
+    a = np.pi**2*np.asarray(fp, dtype=np.float64)[..., None]**2
+    tau2 = delay(t0, t)**2
+    return (1 - 2*a*tau2)*np.exp(-a*tau2)
+
+def brune_batch(T, t0, t):
+    """
+    Brune (omega-squared) moment rate functions, normalized to unit area.
+
+    Input arguments:
+        T : Characteristic source times
+        t0 : Onset times
+        t : Time array
+    """
+    T = np.asarray(T, dtype=np.float64)[..., None]
+    tau = np.maximum(delay(t0, t), 0)
+    return np.exp(-tau/T) * tau / T**2
+
+def minimum_phase_batch(T, t0, t):
+    """
+    Minimum phase functions (see `minimum_phase`), delayed by the onset times
+    `t0`. Same as `brune_batch`.
+
+    """
+    return brune_batch(T, t0, t)
+
+def triangle_batch(T, t0, t):
+    """
+    Symmetric triangle functions of duration `T`, normalized to unit area.
+
+    Input arguments:
+        T : Durations
+        t0 : Onset times
+        t : Time array
+    """
+    T = np.asarray(T, dtype=np.float64)[..., None]
+    tau = delay(t0, t)
+    return np.maximum(T/2 - np.abs(tau - T/2), 0) * 4 / T**2
+
+def yoffe_batch(tau_r, tau_s, t0, t):
+    """
+    Regularized Yoffe functions (Tinti et al. 2005), normalized to unit area.
+
+    The Yoffe function of rise time `tau_r` is averaged over each time step,
+    which removes its singularity at the onset, and then convolved with a
+    triangle of half-duration `tau_s` that is averaged over each time step in
+    the same way. Use `tau_s = 0` for no regularization. The time array must
+    be uniformly spaced.
+
+    Input arguments:
+        tau_r : Rise times
+        tau_s : Half-durations of the regularizing triangle functions
+        t0 : Onset times
+        t : Time array
+    """
+    t = np.asarray(t, dtype=np.float64)
+    dt = t[1] - t[0]
+    tau_r = np.asarray(tau_r, dtype=np.float64)[..., None]
+    tau_s = np.asarray(tau_s, dtype=np.float64)[..., None]
+    tau = delay(t0, t)
+
+    # Antiderivative of sqrt((tau_r - t) / t) on [0, tau_r]
+    def F(s):
+        s = np.clip(s, 0, tau_r)
+        return np.sqrt(s * (tau_r - s)) + tau_r * np.arcsin(np.sqrt(s /
+                                                                    tau_r))
+
+    # Antiderivative of the triangle function of half-duration tau_s, which
+    # becomes a step function for tau_s = 0
+    def G(s):
+        u = np.clip(s / np.where(tau_s > 0, tau_s, 1), 0, 2)
+        ramp = np.where(u < 1, u**2 / 2, 1 - (2 - u)**2 / 2)
+        return np.where(tau_s > 0, ramp, s > 0)
+
+    yoffe = 2 / (np.pi * tau_r) * (F(tau + dt) - F(tau)) / dt
+    s = t - t[0]
+    tri = (G(s + dt) - G(s)) / dt
+    yoffe, tri = np.broadcast_arrays(yoffe, tri)
+    nt = len(t)
+    nfft = 1 << (2 * nt - 2).bit_length()
+    out = np.fft.irfft(np.fft.rfft(yoffe, nfft) * np.fft.rfft(tri, nfft),
+                       nfft)[..., :nt] * dt
+    return np.where(tau >= 0, out, 0)
@@ -0,0 +1,33 @@
+import pytest
+import numpy as np
+import pyawp
+
+def init_config(path):
+    return pyawp.Config(check_dirs=False, output_path=str(path), nx=4, ny=3,
+                        nz=2, nbgx=1, nedx=4, nskpx=1, nbgy=1, nedy=3, nskpy=1,
+                        nbgz=1, nedz=2, nskpz=1, write_step=5, ntiskp=2,
+                        topo_auto_adjust=False)
+
+def test_load_data_mmap(tmp_path):
+    cfg = init_config(tmp_path)
+    nx, ny, nz = cfg.output_size(0)
+    data = np.random.rand(5, nz, ny, nx).astype(np.float32)
+    data.tofile('%s/%s' % (tmp_path, cfg.output_file('x', 0, 2)))
+
+    u = cfg.load_data('x', 0, num=2)
+    v = cfg.load_data('x', 0, num=2, mmap=1)
+    assert isinstance(v.data.base, np.memmap)
+    assert v.data.shape == (nx, ny, nz, 5)
+    assert np.all(u.data == v.data)
+    assert np.all(v.data[:, :, 0, 3] == data[3, 0, :, :].T)
+    assert np.all(u.t == v.t)
+
+def test_load_data_mmap_size(tmp_path):
+    cfg = init_config(tmp_path)
+    nx, ny, nz = cfg.output_size(0)
+    for n in [4, 6]:
+        data = np.random.rand(n, nz, ny, nx).astype(np.float32)
+        data.tofile('%s/%s' % (tmp_path, cfg.output_file('x', 0, 1)))
+        for mmap in [0, 1]:
+            with pytest.raises(ValueError):
+                cfg.load_data('x', 0, num=1, mmap=mmap)
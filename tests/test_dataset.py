@@ -0,0 +1,39 @@
+import numpy as np
+import pyawp
+
+def init_dataset(path, num_frames=3):
+    cfg = pyawp.Config(check_dirs=False, output_path=str(path), nx=4, ny=3,
+                       nz=2, nbgx=1, nedx=4, nskpx=1, nbgy=1, nedy=3, nskpy=1,
+                       nbgz=1, nedz=2, nskpz=1, write_step=5, ntiskp=2,
+                       topo_auto_adjust=False)
+    nx, ny, nz = cfg.output_size(0)
+    data = np.random.rand(5 * num_frames, nz, ny, nx).astype(np.float32)
+    for num in range(1, num_frames + 1):
+        data[5 * (num - 1):5 * num].tofile('%s/%s' % (path,
+                                           cfg.output_file('z', 0, num)))
+    return pyawp.Dataset(cfg, 'z'), data.T
+
+def test_steps(tmp_path):
+    ds, data = init_dataset(tmp_path)
+    assert ds.num_frames == 3
+    assert ds.shape == data.shape
+    assert np.all(ds.steps(0, 15) == data)
+    assert np.all(ds.steps(3, 12) == data[..., 3:12])
+    assert np.all(ds.steps(7, 8) == data[..., 7:8])
+
+def test_window(tmp_path):
+    ds, data = init_dataset(tmp_path)
+    out = ds.window(ds.t[4], ds.t[11])
+    assert np.all(out.data == data[..., 4:11])
+    assert np.allclose(out.t, ds.t[4:11])
+
+def test_frames(tmp_path):
+    ds, data = init_dataset(tmp_path)
+    for prefetch in [0, 1]:
+        t = []
+        v = []
+        for ti, vi in ds.frames(prefetch=prefetch):
+            t.append(ti)
+            v.append(vi)
+        assert np.allclose(np.concatenate(t), ds.t)
+        assert np.all(np.concatenate(v, axis=-1) == data)
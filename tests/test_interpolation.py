@@ -67,3 +67,76 @@ def test_lagrange():
     degree = np.array([0, 0, 0])
     lagrn = interp.lagrange(query, grid, degree=degree)
     assert np.all(np.isclose(np.abs(nearest - lagrn), 0))
+
+def test_lagrange_batch():
+    from pyawp.lagrange import lagrange
+    query = np.array([[1.1, 1.5, 1.6], [0.2, 8.7, 4.4], [9.0, 3.3, 0.0]])
+    grid = Struct()
+    grid.x = np.arange(0, 10)
+    grid.y = np.arange(0, 8) * 1.5
+    grid.z = np.arange(0, 6)
+    grid.t = np.linspace(0, 1, 20)
+    grid.data = np.random.rand(10, 8, 6, 20)
+    degree = np.array([1, 2, 3])
+    lagrn = interp.lagrange(query, grid, degree=degree)
+    assert lagrn.shape == (3, 20)
+
+    # Compare to per-point evaluation
+    nnodes = degree + 1
+    for l, qp in enumerate(query):
+        ref = np.zeros((20,))
+        _, idx_x = interp.argnearest_range(qp[0], grid.x, nnodes[0] // 2,
+                                           nnodes[0] // 2)
+        _, idx_y = interp.argnearest_range(qp[1], grid.y, nnodes[1] // 2,
+                                           nnodes[1] // 2)
+        _, idx_z = interp.argnearest_range(qp[2], grid.z, nnodes[2] // 2,
+                                           nnodes[2] // 2)
+        Lx = lagrange(qp[0], grid.x[idx_x])
+        Ly = lagrange(qp[1], grid.y[idx_y])
+        Lz = lagrange(qp[2], grid.z[idx_z])
+        for i, xi in enumerate(idx_x):
+            for j, yj in enumerate(idx_y):
+                for k, zk in enumerate(idx_z):
+                    ref += Lx[i] * Ly[j] * Lz[k] * grid.data[xi, yj, zk, :]
+        assert np.allclose(lagrn[l], ref)
+
+def test_argnearest_vectorized():
+    qp = np.random.rand(100) * 12 - 1
+    grids = [np.arange(0, 10), np.sort(np.random.rand(10)) * 10,
+             np.arange(0, 10)[::-1]]
+    for x in grids:
+        ref = [np.argmin(abs(qi - x)) for qi in qp]
+        assert np.all(interp.argnearest(qp, x) == ref)
+        inearest, idx = interp.argnearest_ranges(qp, x, 2, 1)
+        assert np.all(inearest == ref)
+        for i, qi in enumerate(qp):
+            _, irange = interp.argnearest_range(qi, x, 2, 1)
+            assert np.all(idx[i] == list(irange))
+
+    # Ties go to the first index
+    for x in [np.linspace(0, 1, 11), np.linspace(0, 1, 11)[::-1],
+              np.array([0, 0.1, 0.3, 0.6])[::-1]]:
+        qp = (x[1:] + x[:-1]) / 2
+        ref = [np.argmin(abs(qi - x)) for qi in qp]
+        assert np.all(interp.argnearest(qp, x) == ref)
+    assert interp.argnearest(0.05, np.linspace(0, 1, 11)[::-1]) == 9
+
+def test_operator(tmp_path):
+    query = np.array([[1.1, 1.5, 1.6], [0.2, 8.7, 4.4]])
+    x = np.arange(0, 10)
+    grid = Struct()
+    grid.x = x
+    grid.y = x
+    grid.z = x
+    grid.t = np.linspace(0, 1, 20)
+    grid.data = np.random.rand(10, 10, 10, 20)
+    op = interp.lagrange_operator(query, x, x, x, degree=2)
+    assert np.allclose(op.apply(grid), interp.lagrange(query, grid, 2))
+
+    op.save('%s/op.npz' % tmp_path)
+    op2 = interp.load_operator('%s/op.npz' % tmp_path)
+    data = np.random.rand(10, 10, 10, 20)
+    assert np.allclose(op2(data), op(data))
+
+    nearest = interp.lagrange_operator(query, x, x, x, degree=0)
+    assert np.allclose(nearest(grid), interp.nearest(query, grid))
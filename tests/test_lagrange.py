@@ -9,3 +9,35 @@ def test_accuracy():
     for p in degrees:
         y = x**p
         assert np.isclose(L.dot(y), x0**p)
+
+def test_basis():
+    x = np.array([0, 1, 2])
+    x0 = np.array([0.5, 1.0, 1.7, 3.2])
+    L = lagrange.basis(x0, x)
+    assert L.shape == (4, 3)
+    assert np.allclose(np.sum(L, axis=1), 1.0)
+    assert np.allclose(L[1], [0, 1, 0])
+    for p in range(3):
+        assert np.allclose(L.dot(x**p), x0**p)
+
+    # One set of nodes per point
+    xs = np.array([[0, 1, 2], [1, 2, 3], [0, 0.5, 2], [2, 3, 4]])
+    L = lagrange.basis(x0, xs)
+    for i in range(4):
+        assert np.allclose(L[i], lagrange.lagrange(x0[i], xs[i]))
+        assert np.allclose(L[i].dot(xs[i]**2), x0[i]**2)
+
+def test_weights_cache():
+    lagrange.spacing_weights.cache_clear()
+    x = 0.1 * np.arange(100) + 0.05
+    xs = np.array([x[i:i + 4] for i in range(96)])
+    w = lagrange.weights(xs)
+    assert lagrange.spacing_weights.cache_info().currsize == 1
+    for i in [0, 50, 95]:
+        d = xs[i][:, None] - xs[i][None, :]
+        np.fill_diagonal(d, 1.0)
+        assert np.allclose(w[i], 1.0 / np.prod(d, axis=1))
+    # Different grid spacing, same relative spacing
+    lagrange.weights(10 * xs)
+    assert lagrange.spacing_weights.cache_info().currsize == 1
+    assert np.allclose(lagrange.weights(xs[0][::-1]), w[0][::-1])
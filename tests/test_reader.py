@@ -1,3 +1,4 @@
+import os
 import pyawp
 import numpy as np
 
@@ -10,3 +11,63 @@ def test_load_selected():
     w = pyawp.load_selected("fixtures/recv_x", 1000, selection=selection)
     for i in range(len(selection)):
         assert np.all(np.isclose(w[:,i], v[:,selection[i]]))
+
+def test_load_selected_runs():
+    t, v = pyawp.load("fixtures/recv_x", num_outputs=25)
+    selection = [3, 4, 5, 0, 20, 21, 4, 24]
+    for threads in [None, 2]:
+        w = pyawp.load_selected("fixtures/recv_x", 1000, selection=selection,
+                                threads=threads)
+        assert w.dtype == np.float32
+        assert np.all(w == v[:, selection])
+    w = pyawp.load_selected("fixtures/recv_x", 1000, selection=selection,
+                            out_dtype=np.float64)
+    assert w.dtype == np.float64
+
+def test_load_window():
+    t, v = pyawp.load("fixtures/recv_x", num_outputs=25, dt=0.1)
+    tw, w = pyawp.load_window("fixtures/recv_x", t[100], t[250],
+                              num_outputs=25, dt=0.1)
+    assert np.allclose(tw, t[100:250])
+    assert np.all(w == v[100:250])
+    selection = [7, 2, 3]
+    tw, w = pyawp.load_window("fixtures/recv_x", 0.0, 1e3, num_outputs=25,
+                              dt=0.1, selection=selection)
+    assert np.all(w == v[:, selection])
+
+def test_load_blocks():
+    t, v = pyawp.load("fixtures/recv_x", num_outputs=25)
+    tb = []
+    vb = []
+    for ti, vi in pyawp.load_blocks("fixtures/recv_x", 300, num_outputs=25,
+                                    selection=[4, 1]):
+        assert vi.shape[0] <= 300
+        tb.append(ti)
+        vb.append(vi)
+    assert np.allclose(np.concatenate(tb), t)
+    assert np.all(np.concatenate(vb) == v[:, [4, 1]])
+
+def test_load_all(tmp_path):
+    t, v = pyawp.load("fixtures/recv_x", num_outputs=25)
+    for field in ['x', 'y']:
+        v.T.tofile('%s/recv_1_%s_02' % (tmp_path, field))
+    t1, x, y = pyawp.load_all('%s/recv' % tmp_path, 'x y', refine=1,
+                              num_outputs=25, dt=0.1)
+    assert np.allclose(t1, pyawp.time(1000, 0.05)[::2])
+    assert np.all(x == v[::2])
+    assert np.all(y == v[::2])
+    t1, x = pyawp.load_all('%s/recv' % tmp_path, 'x', refine=1,
+                           num_outputs=25, dt=0.1, coarsen=0)
+    assert np.all(x == v)
+
+def test_load_edge_3d(tmp_path):
+    d = np.random.rand(20, 10)
+    header = ','.join(['c%d' % i for i in range(10)])
+    np.savetxt('%s/edge.csv' % tmp_path, d, delimiter=',', header=header,
+               comments='')
+    for i in range(2):
+        data = pyawp.load_edge_3d(str(tmp_path), 'edge.csv')
+        assert np.allclose(data.t, d[:, 0])
+        assert np.allclose(data.vx, d[:, 7])
+        assert np.allclose(data.vz, d[:, 9])
+    assert os.path.exists('%s/edge.csv.0-7-8-9.npy' % tmp_path)
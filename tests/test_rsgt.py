@@ -0,0 +1,38 @@
+import numpy as np
+from pyawp import rsgt
+
+def test_fromrsgtfile_batch(tmp_path):
+    filename = '%s/sgt' % tmp_path
+    nt = 30
+    np.random.rand(10, 6, nt).astype(np.float32).tofile(filename)
+    indices = [7, 2, 2, 9]
+    sgt = rsgt.fromrsgtfile_batch(filename, indices, nt)
+    awp = rsgt.fromrsgtfile_batch(filename, indices, nt, awp=True)
+    assert sgt.shape == (4, nt, 6)
+    for i, idx in enumerate(indices):
+        ref = rsgt.fromrsgtfile(filename, idx, nt)
+        assert np.all(sgt[i] == ref)
+        assert np.all(awp[i] == rsgt.rwgtoawp(ref))
+
+def test_rwgtoawp():
+    sgt = np.random.rand(4, 30, 6)
+    ref = np.zeros(sgt.shape)
+    ref[..., 0] = sgt[..., 1]
+    ref[..., 1] = sgt[..., 0]
+    ref[..., 2:4] = sgt[..., 2:4]
+    ref[..., 4] = -sgt[..., 5]
+    ref[..., 5] = -sgt[..., 4]
+    assert np.all(rsgt.rwgtoawp(sgt) == ref)
+    assert np.all(rsgt.rwgtoawp(sgt[0]) == ref[0])
+    out = rsgt.rwgtoawp(sgt, inplace=True)
+    assert out is sgt
+    assert np.all(sgt == ref)
+
+def test_compute_velocity_rwg():
+    from pyawp import compute_velocity
+    mij = list(np.random.rand(6, 30))
+    Gij = np.random.rand(30, 6)
+    awp = rsgt.rwgtoawp(Gij)
+    v = compute_velocity(mij, list(awp.T))
+    w = compute_velocity(mij, list(Gij.T), rwg=True)
+    assert np.allclose(v, w)
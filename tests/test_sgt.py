@@ -0,0 +1,39 @@
+import numpy as np
+from pyawp import sgt, rsgt
+
+def test_compute_velocities():
+    nsrc = 5
+    nt = 40
+    mij = np.random.rand(nsrc, 6, nt)
+    Gij = np.random.rand(nsrc, nt, 6)
+    ref = np.array([sgt.compute_velocity(list(mij[i]), list(Gij[i].T))
+                    for i in range(nsrc)])
+    v = sgt.compute_velocities(mij, Gij, chunk_size=2)
+    assert np.allclose(v, ref)
+    assert np.allclose(sgt.compute_velocities(mij, Gij, total=True),
+                       np.sum(ref, axis=0))
+    awp = rsgt.rwgtoawp(Gij)
+    assert np.allclose(sgt.compute_velocities(mij, Gij, rwg=True),
+                       sgt.compute_velocities(mij, awp))
+
+    slip_rate = np.random.rand(nsrc, 10)
+    v = sgt.compute_velocities(mij, Gij, slip_rate=slip_rate, dt=0.1)
+    for i in range(nsrc):
+        assert np.allclose(v[i], 0.1 * np.convolve(ref[i], slip_rate[i])[:nt])
+
+def test_stacked_conversion():
+    nt = 50
+    nr = 7
+    s = np.random.rand(6, nt, nr)
+    lam = 1 + np.random.rand(1, nr)
+    mu = 1 + np.random.rand(1, nr)
+    e = sgt.stresses_to_strains_stacked(s, 1 / lam, 1 / mu, chunk_size=20)
+    ref = sgt.stresses_to_strains(*s, 1 / lam, 1 / mu)
+    assert np.allclose(e, np.array(ref))
+
+    u = sgt.strains_to_stresses_stacked(e, lam, mu, chunk_size=20)
+    assert np.allclose(u, np.array(sgt.strains_to_stresses(*e, lam, mu)))
+    assert np.allclose(u, s)
+
+    sgt.stresses_to_strains_stacked(s, 1 / lam, 1 / mu, out=s)
+    assert np.allclose(s, e)
@@ -0,0 +1,27 @@
+import pytest
+import numpy as np
+from pyawp import sismowine
+
+def test_read_write(tmp_path):
+    filename = '%s/solution.txt' % tmp_path
+    solutions = [np.random.randn(50) for i in range(7)]
+    sismowine.write(filename, solutions, 0.01, block_size=3)
+    u, t = sismowine.read(filename)
+    assert len(u) == 7
+    assert np.allclose(t, 0.01 * np.arange(50))
+    for ui, si in zip(u, solutions):
+        assert np.allclose(ui, si, rtol=1e-6)
+    v, t = sismowine.read(filename, selection=[6, 2])
+    assert np.all(v[0] == u[6])
+    assert np.all(v[1] == u[2])
+
+def test_read_selection_errors(tmp_path):
+    filename = '%s/solution.txt' % tmp_path
+    solutions = [np.random.randn(50) for i in range(3)]
+    sismowine.write(filename, solutions, 0.01)
+    with pytest.raises(IndexError):
+        sismowine.read(filename, selection=[5])
+    with pytest.raises(IndexError):
+        sismowine.read(filename, selection=[-1])
+    with pytest.raises(ValueError):
+        sismowine.read(filename, record_skip=1, selection=[2])
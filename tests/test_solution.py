@@ -0,0 +1,37 @@
+import numpy as np
+from pyawp import solution
+
+def test_norm(tmp_path):
+    u = [np.random.rand(100), np.random.rand(1000).astype(np.float32)]
+    v = [np.random.rand(100), np.random.rand(1000).astype(np.float32)]
+    err = solution.norm(u, v, chunk_size=33)
+    rel = solution.norm(u, v, relative=1)
+    for i in range(2):
+        d = u[i].astype(np.float64) - v[i]
+        assert np.isclose(err.e1[i], np.linalg.norm(d, ord=1))
+        assert np.isclose(err.e2[i], np.linalg.norm(d, ord=2))
+        assert np.isclose(err.inf[i], np.max(np.abs(d)))
+        assert np.isclose(rel.e2[i], err.e2[i] / np.linalg.norm(u[i]))
+        assert np.isclose(err.table[i]['e1_rel'], rel.e1[i])
+
+    u[1].tofile('%s/u' % tmp_path)
+    v[1].tofile('%s/v' % tmp_path)
+    mm = solution.norm(['%s/u' % tmp_path], ['%s/v' % tmp_path],
+                       chunk_size=100)
+    assert np.isclose(mm.e2[0], err.e2[1])
+
+def test_norm_zero():
+    err = solution.norm([np.zeros(10)], [np.zeros(10)])
+    assert err.e1[0] == 0 and err.e2[0] == 0 and err.inf[0] == 0
+    rel = solution.norm([np.zeros(10)], [np.zeros(10)], relative=1)
+    assert np.isnan(rel.e2[0])
+
+def test_norm_nan():
+    u = np.random.rand(100)
+    v = np.random.rand(100)
+    v[37] = np.nan
+    err = solution.norm([u], [v], chunk_size=10)
+    assert np.isnan(err.e1[0])
+    assert np.isnan(err.e2[0])
+    assert np.isnan(err.inf[0])
+    assert np.isnan(err.table[0]['inf_rel'])
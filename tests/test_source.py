@@ -0,0 +1,164 @@
+import pytest
+import numpy as np
+import pyawp
+
+def init_source(path, nsrc=3):
+    cfg = pyawp.Config(check_dirs=False, input_path=str(path), nsrc=nsrc,
+                       tmax=0.1, dt=0.01, topo_auto_adjust=False)
+    src = pyawp.Source(cfg)
+    for i in range(nsrc):
+        src.sources[i] = pyawp.MomentTensor(*np.random.rand(6, 10),
+                                            pos=[i, 2 * i, 3 * i])
+    return src
+
+def test_write(tmp_path):
+    src = init_source(tmp_path, nsrc=5)
+    src.write(chunk_size=2)
+    expected = '%s/expected' % tmp_path
+    for i, s in enumerate(src.sources):
+        pyawp.source.write(expected, s.stack(), s.pos, overwrite=i == 0)
+    assert open(src.file(), 'rb').read() == open(expected, 'rb').read()
+
+def test_moment_tensors(tmp_path):
+    nsrc = 4
+    M = np.random.rand(nsrc, 6, 10)
+    mts = pyawp.MomentTensors(M=M.copy(), pos=np.arange(3 * nsrc))
+    assert np.all(mts[1].stack() == M[1])
+    assert np.all(mts[2].pos == [6, 7, 8])
+    mts[3].xx = 0
+    mts[3].pos[2] += 1
+    assert np.all(mts.M[3, 0] == 0)
+    assert mts.pos[3, 2] == 12
+
+    filename = '%s/src' % tmp_path
+    expected = '%s/expected' % tmp_path
+    mts.write(filename, chunk_size=3)
+    for i, mt in enumerate(mts):
+        pyawp.source.write(expected, mt.stack(), mt.pos, overwrite=i == 0)
+    assert open(filename, 'rb').read() == open(expected, 'rb').read()
+
+def test_moment_tensors_operations():
+    M = np.random.rand(3, 6, 10)
+    mts = pyawp.MomentTensors(M=M.copy())
+    mts.scale([1, 2, 3])
+    assert np.allclose(mts.M[2], 3 * M[2])
+
+    phi = 0.3
+    R = np.array([[np.cos(phi), 0, -np.sin(phi)], [0, 1, 0],
+                  [np.sin(phi), 0, np.cos(phi)]])
+    mts = pyawp.MomentTensors(M=M.copy())
+    mts.rotate(R)
+    for i in range(3):
+        assert np.allclose(mts.M[i], pyawp.rotate.tensor_xz(phi, *M[i]))
+
+    mts = pyawp.MomentTensors(M=M.copy())
+    mts.shift([0, 0.2, -0.1], 0.1)
+    assert np.all(mts.M[0] == M[0])
+    assert np.all(mts.M[1][:, 2:] == M[1][:, :-2])
+    assert np.all(mts.M[1][:, :2] == 0)
+    assert np.all(mts.M[2][:, :-1] == M[2][:, 1:])
+
+def test_read(tmp_path):
+    M = np.random.rand(5, 6, 10)
+    mts = pyawp.MomentTensors(M=M, pos=np.arange(15))
+    filename = '%s/src' % tmp_path
+    mts.write(filename)
+
+    pos, out = pyawp.source.read(filename, index=3, nst=10)
+    assert np.all(pos == [9, 10, 11])
+    assert np.allclose(out, M[3])
+
+    rec = pyawp.source.memmap(filename, nst=10)
+    assert rec.shape == (5,)
+    assert np.allclose(rec[1:3]['M'], M[1:3].transpose((0, 2, 1)))
+
+    sub = pyawp.source.read_tensors(filename, 10, index=[4, 0])
+    assert np.allclose(sub.M, M[[4, 0]])
+    assert np.all(sub.pos[0] == [12, 13, 14])
+
+    pyawp.source.write(filename, M[0], np.array([1, 2, 3]), overwrite=1)
+    pos, out = pyawp.source.read(filename)
+    assert np.all(pos == [1, 2, 3])
+    assert np.allclose(out, M[0])
+
+def test_write_input(tmp_path):
+    n = 1000
+    types = np.random.randint(0, 3, n)
+    x, y, z = np.random.rand(3, n).astype(np.float32) * 1e4
+    filename = '%s/recv.txt' % tmp_path
+    params = {'file' : 'recv', 'steps' : 100, 'degree' : 2}
+    pyawp.write_recv_input(filename, params, types, x, y, z, verbose=False)
+    lines = open(filename).read().split('\n')
+    assert lines[-2] == "%d %f %f %f " % (types[-1], x[-1], y[-1], z[-1])
+    coords = lines[lines.index('coordinates') + 1:-1]
+    assert len(coords) == n
+    for i in [0, 1, 500, 999]:
+        assert coords[i] == "%d %f %f %f " % (types[i], x[i], y[i], z[i])
+
+    pyawp.write_recv_input(filename, params, types, x, y, z, verbose=False,
+                           binary=True)
+    data = open(filename, 'rb').read()
+    marker = b'\nbinary coordinates\n'
+    offset = data.index(marker) + len(marker)
+    header = data[:offset].decode().split('\n')
+    assert 'length=%d' % n in header
+    assert 'degree=2' in header
+    rec = np.frombuffer(data[offset:], dtype=pyawp.source.coordinate_dtype())
+    assert np.all(rec['type'] == types)
+    assert np.all(rec['x'] == x)
+    assert np.all(rec['z'] == z)
+
+def test_moment_tensors_slicing():
+    M = np.random.rand(5, 6, 10)
+    mts = pyawp.MomentTensors(M=M.copy(), pos=np.arange(15))
+    sub = mts[1:3]
+    assert isinstance(sub, pyawp.MomentTensors)
+    assert len(sub) == 2
+    assert np.all(sub.M == M[1:3])
+    assert np.all(sub[0].pos == [3, 4, 5])
+    sub.scale(2)
+    assert np.allclose(mts.M[1:3], 2 * M[1:3])
+
+    sel = mts[np.array([4, 0])]
+    assert np.all(sel.M == mts.M[[4, 0]])
+    assert np.all(sel.pos[0] == [12, 13, 14])
+    assert np.all(mts[np.int64(3)].stack() == M[3])
+    assert [mt.pos[0] for mt in mts[::2]] == [0, 6, 12]
+
+    mts[0:2] = sel
+    assert np.all(mts.M[0] == sel.M[0])
+
+def test_moment_tensors_slice_operations():
+    M = np.random.rand(5, 6, 10)
+    pos = np.arange(15, dtype=np.int32)
+    mts = pyawp.MomentTensors(M=M, pos=pos)
+    assert mts.M is M
+    sub = mts[1:3]
+    sub[0].pos = [7, 8, 9]
+    assert np.all(pos[3:6] == [7, 8, 9])
+
+    expected = M[1:3].copy()
+    theta = 0.3
+    R = np.array([[np.cos(theta), 0, np.sin(theta)], [0, 1, 0],
+                  [-np.sin(theta), 0, np.cos(theta)]])
+    ref = pyawp.MomentTensors(M=expected)
+    ref.rotate(R)
+    sub.rotate(R)
+    assert np.allclose(M[1:3], ref.M)
+
+    ref.shift(0.2, 0.1)
+    sub.shift(0.2, 0.1)
+    assert np.allclose(M[1:3], ref.M)
+    assert np.all(M[1:3, :, :2] == 0)
+
+def test_moment_tensors_slice_time_functions():
+    mts = pyawp.MomentTensors(4, 10)
+    stf = np.random.rand(2, 10)
+    m = np.arange(6)
+    mts[2:4].set_time_functions(stf, m)
+    assert np.allclose(mts.M[2:4], m[None, :, None] * stf[:, None, :])
+    assert np.all(mts.M[:2] == 0)
+    with pytest.raises(ValueError):
+        mts[2:4].set_time_functions(np.ones((2, 5)), m)
+    mts.set_time_functions(np.ones((4, 5)), m)
+    assert mts.nst == 5
@@ -0,0 +1,37 @@
+import numpy as np
+import pyawp
+from pyawp import sourcefcns
+
+def test_batch():
+    t = np.linspace(0, 10, 2001)
+    dt = t[1] - t[0]
+    fp = np.array([1.0, 2.0, 0.5])
+    t0 = np.array([0.5, 1.0, 2.0])
+    stf = sourcefcns.ricker_batch(fp, t0, t)
+    assert stf.shape == (3, 2001)
+    for i in range(3):
+        assert np.allclose(stf[i], sourcefcns.ricker(fp[i], t0[i], t))
+    assert sourcefcns.ricker_batch(1.0, 1.0, t).shape == (2001,)
+
+    T = np.array([0.2, 0.5, 1.0])
+    for stf in [sourcefcns.brune_batch(T / 10, t0, t),
+                sourcefcns.triangle_batch(T, t0, t),
+                sourcefcns.yoffe_batch(T, T / 10, t0, t)]:
+        assert np.allclose(np.sum(stf, axis=1) * dt, 1.0, atol=1e-2)
+        assert np.all(stf[t[None, :] < t0[:, None] - 1e-9] == 0)
+
+def test_set_time_functions():
+    t = np.linspace(0, 1, 100)
+    stf = sourcefcns.triangle_batch([0.1, 0.2], [0.1, 0.3], t)
+    mts = pyawp.MomentTensors(2, 100)
+    mts.set_time_functions(stf, [1, 1, 1, 0, 0, 0])
+    assert np.all(mts[1].zz == stf[1])
+    assert np.all(mts[0].xy == 0)
+
+def test_yoffe_small_tau_s():
+    dt = 0.01
+    t = np.arange(0, 2, dt)
+    for tau_s in [0, dt / 4, dt / 2, 0.6 * dt, dt, 2 * dt]:
+        stf = sourcefcns.yoffe_batch(0.5, tau_s, 0.1, t)
+        assert np.all(np.isfinite(stf))
+        assert np.isclose(np.sum(stf) * dt, 1.0)
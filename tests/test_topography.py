@@ -0,0 +1,87 @@
+import pytest
+import numpy as np
+import pyawp
+from pyawp import Topography
+
+def gaussian(x, y):
+    return np.exp(-(x ** 2 + y ** 2) / 1e4)
+
+def test_map():
+    topo = Topography(10, 7, 10.0, 2)
+    z = topo.map(gaussian)
+    assert z.dtype == np.float32
+    assert np.all(topo.map(gaussian, vectorized=True) == z)
+    assert np.all(topo.map(gaussian, vectorized=True, block_size=3) == z)
+    assert np.all(topo.map(gaussian, block_size=4, processes=2) == z)
+    assert np.allclose(topo.reshape(z)[3, 5], gaussian(topo.x0()[3],
+                                                       topo.y0()[5]))
+
+def test_write_blocks(tmp_path):
+    topo = Topography(10, 7, 10.0, 2)
+    z = topo.map(gaussian, vectorized=True)
+    topo.write(z, '%s/topo' % tmp_path)
+    expected = open('%s/topo' % tmp_path, 'rb').read()
+
+    topo.write_blocks(gaussian, '%s/topo_func' % tmp_path, block_size=3)
+    assert open('%s/topo_func' % tmp_path, 'rb').read() == expected
+
+    zb = topo.reshape(z)
+    blocks = (zb[i:i + 5] for i in range(0, zb.shape[0], 5))
+    topo.write_blocks(blocks, '%s/topo_gen' % tmp_path)
+    assert open('%s/topo_gen' % tmp_path, 'rb').read() == expected
+
+def test_load_xyz_bin(tmp_path):
+    topo = Topography(4, 3, 10.0, 0)
+    nz = 5
+    filename = '%s/mesh' % tmp_path
+    XYZ = np.random.rand(3, 4, 3, nz).astype(np.float32)
+    XYZ.ravel(order='F').tofile(filename)
+
+    X, Y, Z = topo.load_xyz_bin(filename, nz)
+    Xm, Ym, Zm = topo.load_xyz_bin(filename, nz, mmap=True)
+    assert np.all(X == XYZ[0]) and np.all(Xm == X)
+    assert np.all(Ym == Y) and np.all(Zm == Z)
+
+    Xs, Ys, Zs = topo.load_xyz_slice(filename, nz, 2)
+    assert np.all(Zs == Z[:, :, 2])
+    Xc, Yc, Zc = topo.load_xyz_column(filename, nz, 1, 2)
+    assert np.all(Yc == Y[1, 2, :])
+    box = topo.load_xyz_box(filename, nz, i=(1, 3), k=(0, 2))
+    assert np.all(box[0] == X[1:3, :, 0:2])
+
+def test_xyz_to_npz(tmp_path):
+    topo = Topography(6, 4, 10.0, 1)
+    z = topo.map(gaussian, vectorized=True)
+    X, Y = np.meshgrid(topo.x0(), topo.y0(), indexing='ij')
+    np.savetxt('%s/topo.txt' % tmp_path, np.vstack((X.flatten(), Y.flatten(),
+               z)).T, delimiter='\t')
+
+    C = np.loadtxt('%s/topo.txt' % tmp_path, delimiter='\t')
+    for processes in [None, 2]:
+        D = pyawp.topography.read_xyz('%s/topo.txt' % tmp_path,
+                                      processes=processes, block_size=100)
+        assert np.all(D == C)
+
+    topo.xyz_to_npz('%s/topo.txt' % tmp_path, '%s/topo.npz' % tmp_path)
+    x, y, Z = topo.load_npz('%s/topo.npz' % tmp_path)
+    assert np.allclose(x, topo.x0())
+    assert np.allclose(y, topo.y0())
+    assert np.allclose(Z, topo.reshape(z))
+
+def test_read_xyz_errors(tmp_path):
+    filename = '%s/topo.txt' % tmp_path
+    with open(filename, 'w') as fh:
+        fh.write('# x y z\n1\t2\t3\n4\t5\t6\n\n7\t8\t9\n')
+    for processes in [None, 2]:
+        C = pyawp.topography.read_xyz(filename, processes=processes,
+                                      block_size=12)
+        assert np.all(C == [[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+
+    with open(filename, 'w') as fh:
+        fh.write('1\t2\t3\n4\t5\t6\nx\t8\t9\n')
+    with pytest.raises(ValueError):
+        pyawp.topography.read_xyz(filename, block_size=12)
+    with open(filename, 'w') as fh:
+        fh.write('1\t2\t3\n4\t5\n')
+    with pytest.raises(ValueError):
+        pyawp.topography.read_xyz(filename)
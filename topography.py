@@ -60,12 +60,22 @@ class Topography(object):
         y = np.linspace(-self.ngsl * self.h, (my - 1 - self.ngsl) * self.h, my)
         return y
 
-    def map(self, func, x=None, y=None):
+    def map(self, func, x=None, y=None, vectorized=False, block_size=None,
+            processes=None):
         """
         Generate topography data from function func(x, y)
 
         Args:
             func: Function handle
+            vectorized(optional): Set to `True` if `func` accepts numpy arrays.
+                The function is then called on broadcast arrays of size
+                `block_size x (ny + 2 * ngsl)`.
+            block_size(optional): Number of grid points in the x-direction to
+                evaluate at a time. Defaults to all grid points.
+            processes(optional): Number of processes to evaluate blocks of a
+                function that is not vectorized on. Since the function is sent
+                to other processes, it must be possible to pickle it (e.g., it
+                cannot be a lambda function).
 
         Returns:
             z: A 1-D array containing (nx + 2 * ngsl) * (ny + 2 * ngsl) values,
@@ -82,9 +92,34 @@ class Topography(object):
             x = self.x0()
         if y is None:
             y = self.y0()
-        for i in range(mx):
-            for j in range(my):
-                z[j + my * i] = func(x[i], y[j])
+
+        if block_size is None:
+            if processes:
+                block_size = max(int(np.ceil(mx / (4 * processes))), 1)
+            else:
+                block_size = mx
+        blocks = [x[i:i + block_size] for i in range(0, mx, block_size)]
+
+        if vectorized:
+            i = 0
+            for xb in blocks:
+                zb = func(xb[:,None], y[None,:])
+                zb = np.broadcast_to(zb, (len(xb), my))
+                z[i:i + len(xb) * my] = zb.ravel()
+                i += len(xb) * my
+        elif processes:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                i = 0
+                for zb in executor.map(map_block, [func] * len(blocks), blocks,
+                                       [y] * len(blocks)):
+                    z[i:i + len(zb)] = zb
+                    i += len(zb)
+        else:
+            i = 0
+            for xb in blocks:
+                z[i:i + len(xb) * my] = map_block(func, xb, y)
+                i += len(xb) * my
         return z
 
     def write(self, z, filename):
@@ -97,21 +132,65 @@ class Topography(object):
                 direction.
 
         """
-        header = np.array([self.nx, self.ny, self.ngsl]).astype(np.int32)
-
-        if len(z.shape) == 2:
-            z_out = z.flatten()
-        else:
-            z_out = z
+        z_out = np.ravel(z)
         
         mx = self.nx + 2 * self.ngsl
         my = self.ny + 2 * self.ngsl
         assert z_out.shape[0] == mx * my
 
+        self.write_blocks([z_out], filename)
+
+    def write_blocks(self, blocks, filename, block_size=1):
+        """
+        Write topography data to binary file one block of rows at a time. Only
+        one block needs to be kept in memory. See `write`.
+
+        Args:
+            blocks : Either an iterable (e.g., a generator) that gives blocks of
+                rows (2D arrays of size rows x (ny + 2 * ngsl), or 1D arrays in
+                which the y-direction is the fast direction), or a function
+                `func(x, y)` that evaluates the topography on a strip of
+                x-values `x` (array of size block_size x 1) and the y-values `y`
+                (array of size 1 x (ny + 2 * ngsl)).
+            filename : Binary file to write to.
+            block_size(optional) : Number of rows in each strip when `blocks`
+                is a function.
+
+        """
+        header = np.array([self.nx, self.ny, self.ngsl]).astype(np.int32)
+        mx = self.nx + 2 * self.ngsl
+        my = self.ny + 2 * self.ngsl
 
+        if callable(blocks):
+            blocks = self.strips(blocks, block_size)
+
+        count = 0
         with open(filename, "wb") as fh:
             header.tofile(fh)
-            z_out.astype(np.float32).tofile(fh)
+            for block in blocks:
+                block = np.ravel(block)
+                assert block.shape[0] % my == 0
+                count += block.shape[0]
+                assert count <= mx * my
+                np.asarray(block, dtype=np.float32).tofile(fh)
+        assert count == mx * my
+
+    def strips(self, func, block_size=1):
+        """
+        Evaluate the vectorized function `func(x, y)` on strips of `block_size`
+        x-values at a time.
+
+        Yields:
+            z : Topography data for each strip (2D array of size block_size x
+                (ny + 2 * ngsl)).
+
+        """
+        x = self.x0()
+        y = self.y0()
+        for i in range(0, len(x), block_size):
+            xb = x[i:i + block_size]
+            yield np.broadcast_to(func(xb[:,None], y[None,:]), (len(xb),
+                                                                 len(y)))
 
     def write_grid(self, filename):
         """
@@ -125,7 +204,7 @@ class Topography(object):
 
 
 
-    def load_xyz(self, filename):
+    def load_xyz(self, filename, processes=None):
         """
         Load topography data stored in tab-delimited ASCII file format.
 
@@ -135,8 +214,13 @@ class Topography(object):
           .
           .
 
+        Args:
+            filename: ASCII file to read.
+            processes(optional): Number of processes to parse the file with.
+                See `read_xyz`.
+
         """
-        C = np.loadtxt(filename, delimiter='\t')
+        C = read_xyz(filename, processes=processes)
         x = C[:,0]
         y = C[:,1]
         z = C[:,2]
@@ -149,13 +233,74 @@ class Topography(object):
         Z = np.reshape(z, size).astype(np.float32)
         return X, Y, Z
 
-    def load_xyz_bin(self, filename, nz):
+    def write_npz(self, z, filename, x=None, y=None):
+        """
+        Write topography data to a compact binary file (`.npz` format) that
+        only contains the grid vectors and the topography data, and not the
+        coordinates of every grid point.
+
+        Args:
+            z : Topography data to write, either a 2D array of size
+                (nx + 2 * ngsl) x (ny + 2 * ngsl) or a 1D array in which the
+                y-direction is the fast direction.
+            filename : File to write to.
+            x, y(optional) : Grid vectors. Defaults to `x0()` and `y0()`.
+
+        """
+        if x is None:
+            x = self.x0()
+        if y is None:
+            y = self.y0()
+        np.savez(filename, x=x, y=y, z=self.reshape(z),
+                 header=np.array([self.nx, self.ny, self.ngsl]), h=self.h)
+
+    def load_npz(self, filename):
+        """
+        Load topography data written by `write_npz`.
+
+        Returns:
+            x, y : Grid vectors.
+            z : Topography data, 2D array of size (nx + 2 * ngsl) x (ny + 2 *
+                ngsl).
+
+        """
+        with np.load(filename) as f:
+            x = f['x']
+            y = f['y']
+            z = f['z']
+        assert z.shape == (self.nx + 2 * self.ngsl, self.ny + 2 * self.ngsl)
+        return x, y, z
+
+    def xyz_to_npz(self, filename, output, processes=None):
+        """
+        Convert topography data stored in the ASCII file format (see
+        `load_xyz`) to the binary format (see `write_npz`). The grid points in
+        the ASCII file can be listed in any order.
+
+        Args:
+            filename: ASCII file to read.
+            output: File to write to.
+            processes(optional): Number of processes to parse the file with.
+
+        """
+        C = read_xyz(filename, processes=processes)
+        x = np.unique(C[:,0])
+        y = np.unique(C[:,1])
+        assert C.shape[0] == len(x) * len(y)
+        z = np.zeros((len(x), len(y)), dtype=np.float32)
+        z[np.searchsorted(x, C[:,0]), np.searchsorted(y, C[:,1])] = C[:,2]
+        self.write_npz(z, output, x=x, y=y)
+
+    def load_xyz_bin(self, filename, nz, mmap=False):
         """
         Load curvilinear grid data stored in the binary (mesh) file format.
 
         Args:
             filename: Binary file to read.
             nz: Number of grid points in the z-direction
+            mmap(optional): Memory map the file instead of reading it. The
+                returned arrays are then read-only views and only the parts
+                that are accessed are read from disk.
 
         Returns:
             X, Y, Z : np.Array of size nx x ny x nz. The operation `X[i,j,k]`
@@ -177,19 +322,79 @@ class Topography(object):
             free surface and the next slice is one step below it.
 
         Warning: 
-            This function should only be used for small test problems as it
-            consumes significant amounts of memory: 
+            Unless `mmap = True`, this function should only be used for small
+            test problems as it consumes significant amounts of memory: 
             `3 x nx x ny x x nz x sizeof(float)`
 
         """
-        xyz = np.fromfile(filename, dtype=np.float32)
-        XYZ = xyz.reshape((3, self.nx, self.ny, nz), order='F')
+        if mmap:
+            XYZ = self.mesh(filename, nz)
+        else:
+            xyz = np.fromfile(filename, dtype=np.float32)
+            XYZ = xyz.reshape((3, self.nx, self.ny, nz), order='F')
         X = XYZ[0, :, :, :] 
         Y = XYZ[1, :, :, :] 
         Z = XYZ[2, :, :, :] 
 
         return X, Y, Z
 
+    def mesh(self, filename, nz):
+        """
+        Memory map a curvilinear grid file (see `load_xyz_bin`).
+
+        Returns:
+            XYZ : Read-only np.memmap of size 3 x nx x ny x nz, in which
+                `XYZ[0, i, j, k]` is the x-coordinate of the grid point (i, j,
+                k), etc.
+
+        """
+        return np.memmap(filename, dtype=np.float32, mode='r',
+                         shape=(3, self.nx, self.ny, nz), order='F')
+
+    def load_xyz_slice(self, filename, nz, k):
+        """
+        Load the depth slice `k` (`k = 0` is the free surface) of a curvilinear
+        grid file (see `load_xyz_bin`).
+
+        Returns:
+            X, Y, Z : np.Array of size nx x ny.
+
+        """
+        return self.load_xyz_box(filename, nz, k=(k, k + 1))[..., 0]
+
+    def load_xyz_column(self, filename, nz, i, j):
+        """
+        Load the grid points (i, j, :) of a curvilinear grid file (see
+        `load_xyz_bin`).
+
+        Returns:
+            X, Y, Z : np.Array of size nz.
+
+        """
+        return self.load_xyz_box(filename, nz, i=(i, i + 1), j=(j, j + 1))[:,
+                                 0, 0, :]
+
+    def load_xyz_box(self, filename, nz, i=None, j=None, k=None):
+        """
+        Load the grid points in a box from a curvilinear grid file (see
+        `load_xyz_bin`). Only the box is read from disk.
+
+        Args:
+            filename: Binary file to read.
+            nz: Number of grid points in the z-direction
+            i, j, k(optional): Index ranges `(first, last + 1)` of the box in
+                each direction. Defaults to all grid points.
+
+        Returns:
+            X, Y, Z : np.Array of size (i[1] - i[0]) x (j[1] - j[0]) x
+                (k[1] - k[0]).
+
+        """
+        XYZ = self.mesh(filename, nz)
+        si, sj, sk = [slice(*r) if r is not None else slice(None)
+                      for r in (i, j, k)]
+        return np.array(XYZ[:, si, sj, sk])
+
     def write_xyz(self, Z, filename):
         """
         Write ASCII file in the format described in `load_xyz`.
@@ -251,3 +456,67 @@ class Topography(object):
                   y0[-dist-1]], style)
         plt.plot([x0[-dist-1], x0[-dist-1]], [y0[dist],
                   y0[-dist-1]], style)
+
+def map_block(func, x, y):
+    """
+    Evaluate `func(x[i], y[j])` one point at a time. See `Topography.map`.
+
+    """
+    my = len(y)
+    z = np.zeros(len(x) * my).astype(np.float32)
+    for i in range(len(x)):
+        for j in range(my):
+            z[j + my * i] = func(x[i], y[j])
+    return z
+
+def read_xyz(filename, processes=None, block_size=2**26):
+    """
+    Read a whitespace-delimited ASCII file that contains three columns (see
+    `Topography.load_xyz`). Lines starting with '#' are skipped.
+
+    The file is parsed in blocks of lines, optionally in parallel.
+
+    Args:
+        filename: ASCII file to read.
+        processes(optional): Number of processes to parse blocks on.
+        block_size(optional): Approximate size of each block in bytes.
+
+    Returns:
+        np.array : Array of size number of lines x 3.
+
+    """
+    blocks = []
+    with open(filename, 'r') as fh:
+        while True:
+            block = fh.read(block_size)
+            if not block:
+                break
+            block += fh.readline()
+            blocks.append(block)
+
+    if processes:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            out = list(executor.map(parse_xyz, blocks))
+    else:
+        out = [parse_xyz(block) for block in blocks]
+
+    if not out:
+        return np.zeros((0, 3))
+    return np.concatenate(out)
+
+def parse_xyz(text):
+    """
+    Parse a block of lines of three whitespace-delimited columns. See
+    `read_xyz`. Empty lines and comment lines starting with '#' are skipped,
+    and lines that cannot be parsed raise a `ValueError`.
+
+    """
+    lines = [line for line in text.splitlines() 
+             if line.strip() and not line.lstrip().startswith('#')]
+    if not lines:
+        return np.zeros((0, 3))
+    out = np.loadtxt(lines, ndmin=2)
+    if out.shape[1] != 3:
+        raise ValueError("Expected 3 columns but found %d" % out.shape[1])
+    return out